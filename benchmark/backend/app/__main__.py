@@ -4,6 +4,13 @@ import uvicorn
 
 from .main import app
 
+try:  # Optional dependency: uvloop speeds up every async backend client
+    import uvloop  # noqa: F401
+except ImportError:  # pragma: no cover - e.g. on Windows
+    EVENT_LOOP = "asyncio"
+else:
+    EVENT_LOOP = "uvloop"
+
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop=EVENT_LOOP)
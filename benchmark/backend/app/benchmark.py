@@ -2,9 +2,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import copy
+import itertools
 import re
-from typing import Any, AsyncIterator, Dict, Iterable, List
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 try:
     import httpx
@@ -19,28 +24,116 @@ except ImportError:  # pragma: no cover - fallback when dependency missing
     httpx = _HttpxProxy()  # type: ignore
 
 from .clients import create_client
-from .clients.base import BackendClient, RequestMetrics
-from .schemas import AutoBenchmarkRequest, BenchmarkParameters, BenchmarkRequest, BenchmarkResult
-from .utils import model_copy, model_dump
+from .clients.base import HTTP2_AVAILABLE, BackendClient, RequestMetrics, make_http_client
+from .models import utcnow
+from .prompt_cache import PromptCache
+from .schemas import (
+    AutoBenchmarkRequest,
+    BenchmarkParameters,
+    BenchmarkProvider,
+    BenchmarkRequest,
+    BenchmarkResult,
+)
+from .serialization import JSONDecodeError, loads as json_loads
 from .settings import settings
 from .stats import StatsAccumulator
+from .utils import model_dump
+
+
+# Matches the first (non-greedy) JSON array embedded in free-form model output.
+_JSON_ARRAY_RE = re.compile(r"\[[\s\S]*?\]")
+
+# Settings attributes holding the default base URL and API key per provider.
+_BASE_URL_ATTRS: Dict[BenchmarkProvider, str] = {
+    BenchmarkProvider.OLLAMA: "ollama_base_url",
+    BenchmarkProvider.NIM: "nim_base_url",
+    BenchmarkProvider.VLLM: "vllm_base_url",
+    BenchmarkProvider.LLAMACPP: "llamacpp_base_url",
+}
+_API_KEY_ATTRS: Dict[BenchmarkProvider, str] = {
+    BenchmarkProvider.NIM: "ngc_api_key",
+    BenchmarkProvider.LLAMACPP: "llamacpp_api_key",
+}
+
+prompt_cache = PromptCache.from_settings(settings)
+
+# Shared HTTP clients keyed by (base_url, timeout, max_connections, max_keepalive,
+# http2). Reusing them across runs avoids rebuilding TLS contexts and connection
+# pools for every combination of an auto-benchmark sweep. At most
+# MAX_SHARED_HTTP_CLIENTS are kept; the least recently used idle ones beyond
+# that are closed.
+MAX_SHARED_HTTP_CLIENTS = 8
+_ClientKey = Tuple[str, float, int, int, bool]
+_client_cache: "OrderedDict[_ClientKey, httpx.AsyncClient]" = OrderedDict()
+# Runs currently using each cached client; leased clients are never evicted.
+_client_leases: "Counter[_ClientKey]" = Counter()
+
+
+@asynccontextmanager
+async def _shared_http_client(
+    base_url: str, timeout: float, max_connections: int, max_keepalive: int, http2: bool
+) -> AsyncIterator[httpx.AsyncClient]:
+    key = (base_url, timeout, max_connections, max_keepalive, http2)
+    http_client = _client_cache.get(key)
+    if http_client is None or http_client.is_closed:
+        http_client = make_http_client(
+            timeout=timeout,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            http2=http2,
+        )
+        _client_cache[key] = http_client
+    _client_cache.move_to_end(key)
+    _client_leases[key] += 1
+    try:
+        yield http_client
+    finally:
+        _client_leases[key] -= 1
+        if not _client_leases[key]:
+            del _client_leases[key]
+        await _evict_idle_clients()
+
+
+async def _evict_idle_clients() -> None:
+    excess = len(_client_cache) - MAX_SHARED_HTTP_CLIENTS
+    if excess <= 0:
+        return
+    # Detach every victim before the first await so a run starting meanwhile
+    # cannot lease a client that is about to be closed.
+    idle = [key for key in _client_cache if key not in _client_leases][:excess]
+    evicted = [_client_cache.pop(key) for key in idle]
+    for http_client in evicted:
+        await http_client.aclose()
+
+
+async def close_shared_clients() -> None:
+    """Close every cached HTTP client; called on application shutdown."""
+    http_clients = list(_client_cache.values())
+    _client_cache.clear()
+    for http_client in http_clients:
+        await http_client.aclose()
 
 
 class BenchmarkExecutor:
     """Execute a benchmark against a given backend."""
 
-    def __init__(self, request: BenchmarkRequest) -> None:
+    def __init__(
+        self,
+        request: BenchmarkRequest,
+        *,
+        reuse_client: bool = True,
+        client: BackendClient | None = None,
+    ) -> None:
         self.request = request
         self.timeout = request.parameters.timeout or settings.default_timeout
+        self.reuse_client = reuse_client
+        self.client = client if client is not None else self._create_client()
         self._resolved_prompts: List[str] | None = None
 
     def _create_client(self) -> BackendClient:
         base_url = self.request.base_url or self._default_base_url()
-        api_key: str | None = None
-        if self.request.provider == self.request.provider.NIM:
-            api_key = settings.ngc_api_key
-        elif self.request.provider == self.request.provider.LLAMACPP:
-            api_key = settings.llamacpp_api_key
+        api_key_attr = _API_KEY_ATTRS.get(self.request.provider)
+        api_key: str | None = getattr(settings, api_key_attr) if api_key_attr else None
         return create_client(
             self.request.provider,
             base_url=base_url,
@@ -52,42 +145,107 @@ class BenchmarkExecutor:
         )
 
     def _default_base_url(self) -> str:
-        if self.request.provider == self.request.provider.OLLAMA:
-            return settings.ollama_base_url
-        if self.request.provider == self.request.provider.NIM:
-            return settings.nim_base_url
-        if self.request.provider == self.request.provider.VLLM:
-            return settings.vllm_base_url
-        if self.request.provider == self.request.provider.LLAMACPP:
-            return settings.llamacpp_base_url
-        raise ValueError(f"Unknown provider {self.request.provider}")
+        attr = _BASE_URL_ATTRS.get(self.request.provider)
+        if attr is None:
+            raise ValueError(f"Unknown provider {self.request.provider}")
+        return getattr(settings, attr)
+
+    def _pool_size(self) -> Tuple[int, int]:
+        parameters = self.request.parameters
+        max_connections = parameters.pool_connections or parameters.concurrency
+        max_keepalive = parameters.pool_keepalive
+        if max_keepalive is None:
+            # Give every concurrent worker a warm keep-alive slot so connections
+            # are not recycled mid-benchmark once concurrency exceeds the default.
+            max_keepalive = parameters.concurrency
+        return max_connections, min(max_keepalive, max_connections)
+
+    @asynccontextmanager
+    async def _http_client(self, base_url: str) -> AsyncIterator[httpx.AsyncClient]:
+        max_connections, max_keepalive = self._pool_size()
+        # HTTP/2 is negotiated via ALPN, so plain-HTTP and HTTP/1.1-only servers
+        # transparently keep using HTTP/1.1.
+        http2 = self.request.parameters.use_http2 and HTTP2_AVAILABLE
+        if self.reuse_client:
+            async with _shared_http_client(
+                base_url, self.timeout, max_connections, max_keepalive, http2
+            ) as http_client:
+                yield http_client
+            return
+
+        async with make_http_client(
+            timeout=self.timeout,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            http2=http2,
+        ) as http_client:
+            yield http_client
 
     async def iter_metrics(self) -> AsyncIterator[RequestMetrics]:
-        client = self._create_client()
-        limits = httpx.Limits(max_connections=self.request.parameters.concurrency)
-        async with httpx.AsyncClient(limits=limits, timeout=self.timeout) as http_client:
+        client = self.client
+        async with self._http_client(client.base_url) as http_client:
             prompts = await self._prepare_prompts(client, http_client)
             self._resolved_prompts = prompts
 
             if self.request.parameters.warmup_requests:
                 await client.warmup(prompts[0], http_client)
 
-            semaphore = asyncio.Semaphore(self.request.parameters.concurrency)
-
-            async def worker(task_index: int) -> RequestMetrics:
-                async with semaphore:
-                    prompt = prompts[task_index % len(prompts)]
-                    return await client.generate(prompt, http_client)
-
-            tasks = [
-                asyncio.create_task(worker(index))
-                for index in range(self.request.parameters.request_count)
-            ]
+            await client.warm_pool(
+                http_client,
+                min(self.request.parameters.concurrency, self.request.parameters.request_count),
+            )
 
-            for task in asyncio.as_completed(tasks):
-                metrics = await task
+            async for metrics in self._dispatch(client, http_client, prompts):
                 yield metrics
 
+    async def _dispatch(
+        self,
+        client: BackendClient,
+        http_client: httpx.AsyncClient,
+        prompts: List[str],
+    ) -> AsyncIterator[RequestMetrics]:
+        """Run ``request_count`` requests with at most ``concurrency`` in flight.
+
+        A fixed pool of ``concurrency`` workers pulls request indices from one
+        shared iterator, so no task or semaphore round trip is spent per request.
+        Finished requests hand their metrics to the consumer through a bounded
+        queue.
+        """
+        request_count = self.request.parameters.request_count
+        concurrency = self.request.parameters.concurrency
+        outcomes: asyncio.Queue[RequestMetrics | Exception] = asyncio.Queue(maxsize=concurrency * 2)
+        # Shared by every worker; next() never awaits, so each index is handed
+        # out exactly once.
+        indices = iter(range(request_count))
+
+        async def worker() -> None:
+            for task_index in indices:
+                prompt = prompts[task_index % len(prompts)]
+                try:
+                    outcome: RequestMetrics | Exception = await client.generate(prompt, http_client)
+                except Exception as exc:  # noqa: BLE001 - re-raised by the consumer
+                    outcome = exc
+                await outcomes.put(outcome)
+
+        async def produce() -> None:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(min(concurrency, request_count)):
+                    group.create_task(worker())
+
+        producer = asyncio.create_task(produce())
+        try:
+            for _ in range(request_count):
+                outcome = await outcomes.get()
+                if isinstance(outcome, Exception):
+                    raise outcome
+                yield outcome
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+
     async def run(self, run_id: int | None = None) -> BenchmarkResult:
         accumulator = StatsAccumulator()
         async for metrics in self.iter_metrics():
@@ -130,13 +288,21 @@ class BenchmarkExecutor:
                 f"{guidance}"
             )
 
-        metrics = await client.generate(instructions, http_client)
-        prompts = self._extract_prompt_list(metrics.completion, prompt_count)
-
-        if not prompts:
-            raise ValueError("Model did not return any prompts that could be parsed.")
+        async def generate() -> List[str]:
+            metrics = await client.generate(instructions, http_client, capture_completion=True)
+            prompts = self._extract_prompt_list(metrics.completion, prompt_count)
+            if not prompts:
+                raise ValueError("Model did not return any prompts that could be parsed.")
+            return prompts
 
-        return prompts
+        key = PromptCache.make_key(
+            self.request.provider.value,
+            client.base_url,
+            self.request.model_name,
+            guidance,
+            prompt_count,
+        )
+        return await prompt_cache.load_or_generate(key, generate)
 
     @staticmethod
     def _extract_prompt_list(response_text: str, expected: int) -> List[str]:
@@ -152,8 +318,8 @@ class BenchmarkExecutor:
         def try_parse(candidate: str) -> None:
             nonlocal prompts
             try:
-                parsed = json.loads(candidate)
-            except json.JSONDecodeError:
+                parsed = json_loads(candidate)
+            except JSONDecodeError:
                 return
             if isinstance(parsed, list):
                 cleaned = [
@@ -164,11 +330,14 @@ class BenchmarkExecutor:
                 if cleaned:
                     prompts = cleaned[:expected]
 
-        try_parse(text)
-        if prompts:
-            return prompts
+        # Only a response that is itself a JSON array can yield prompts here;
+        # chat-style preambles would just fail after a full tokenizer pass.
+        if text.startswith("["):
+            try_parse(text)
+            if prompts:
+                return prompts
 
-        match = re.search(r"\[[\s\S]*?\]", text)
+        match = _JSON_ARRAY_RE.search(text)
         if match:
             try_parse(match.group(0))
             if prompts:
@@ -198,16 +367,26 @@ class BenchmarkExecutor:
         return content
 
 
-async def run_auto_benchmark(request: AutoBenchmarkRequest) -> List[BenchmarkResult]:
-    results: List[BenchmarkResult] = []
-    combos = build_parameter_grid(
-        request.parameters,
-        concurrency_values=request.sweep_concurrency,
-        max_tokens_values=request.sweep_max_tokens,
-        temperature_values=request.sweep_temperature,
-    )
-    for params in combos:
-        bench_request = BenchmarkRequest(
+@dataclass(slots=True)
+class SweepResult:
+    """A finished sweep combination and its position in the parameter grid."""
+
+    index: int
+    result: BenchmarkResult
+    # Naive UTC, like the history columns.
+    started_at: datetime
+    completed_at: datetime
+
+
+def build_sweep_requests(request: AutoBenchmarkRequest) -> List[BenchmarkRequest]:
+    """Validate every sweep combination into the request that will run it.
+
+    Called before a sweep starts streaming so an invalid combination is
+    rejected as a whole (pydantic raises a ``ValueError`` subclass) instead of
+    failing part-way through the response.
+    """
+    return [
+        BenchmarkRequest(
             provider=request.provider,
             model_name=request.model_name,
             prompt=request.prompt,
@@ -216,10 +395,85 @@ async def run_auto_benchmark(request: AutoBenchmarkRequest) -> List[BenchmarkRes
             backend_parameters=request.backend_parameters,
             metadata=request.metadata,
         )
-        executor = BenchmarkExecutor(bench_request)
+        for params in build_parameter_grid(
+            request.parameters,
+            concurrency_values=request.sweep_concurrency,
+            max_tokens_values=request.sweep_max_tokens,
+            temperature_values=request.sweep_temperature,
+        )
+    ]
+
+
+async def run_auto_benchmark(
+    request: AutoBenchmarkRequest, sweep: Optional[List[BenchmarkRequest]] = None
+) -> AsyncIterator[SweepResult]:
+    """Run every sweep combination, yielding each result as soon as it completes.
+
+    Combinations run one at a time unless ``sweep_parallelism`` allows more, in
+    which case results are yielded in completion order rather than grid order;
+    ``SweepResult.index`` always identifies the combination. ``sweep`` is the
+    output of :func:`build_sweep_requests` when the caller has already
+    validated the grid.
+    """
+    parallelism = request.sweep_parallelism
+    if sweep is None:
+        sweep = build_sweep_requests(request)
+    # Only the sampling parameters vary between combinations, so a provider
+    # client is built once per target and re-parameterised for each combo.
+    clients: Dict[Tuple[Any, ...], BackendClient] = {}
+
+    def prepare(bench_request: BenchmarkRequest) -> BenchmarkExecutor:
+        key = _client_key(bench_request)
+        client = clients.get(key)
+        if client is not None:
+            if parallelism > 1:
+                # Concurrent combinations must not share mutable parameters.
+                client = copy.copy(client)
+            client.update_parameters(bench_request.parameters)
+        executor = BenchmarkExecutor(bench_request, client=client)
+        clients.setdefault(key, executor.client)
+        return executor
+
+    async def run_combination(index: int, executor: BenchmarkExecutor) -> SweepResult:
+        started_at = utcnow()
         result = await executor.run()
-        results.append(result)
-    return results
+        return SweepResult(index, result, started_at=started_at, completed_at=utcnow())
+
+    if parallelism == 1:
+        for index, bench_request in enumerate(sweep):
+            yield await run_combination(index, prepare(bench_request))
+        return
+
+    remaining = enumerate(sweep)
+    pending: Set[asyncio.Task[SweepResult]] = set()
+
+    def top_up() -> None:
+        # Only ``parallelism`` combinations exist as tasks at once; executors
+        # for the rest are built as slots free up.
+        for index, bench_request in itertools.islice(remaining, parallelism - len(pending)):
+            pending.add(asyncio.create_task(run_combination(index, prepare(bench_request))))
+
+    top_up()
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            top_up()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let cancelled runs unwind (and release their HTTP clients) before returning.
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _client_key(request: BenchmarkRequest) -> Tuple[Any, ...]:
+    return (
+        request.provider,
+        str(request.base_url) if request.base_url else None,
+        request.model_name,
+        tuple(sorted(model_dump(request.backend_parameters).items())),
+    )
 
 
 def build_parameter_grid(
@@ -228,19 +482,24 @@ def build_parameter_grid(
     concurrency_values: Iterable[int],
     max_tokens_values: Iterable[int],
     temperature_values: Iterable[float],
-) -> List[BenchmarkParameters]:
-    grid: List[BenchmarkParameters] = []
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the cartesian product of the sweep dimensions.
+
+    Combinations are plain parameter dicts; :func:`build_sweep_requests`
+    validates them into ``BenchmarkRequest`` objects.
+    """
+    base_values = model_dump(base)
+    # Deduplicating each dimension (order preserved) guarantees that no
+    # combination is benchmarked twice within a sweep.
+    concurrency_values = list(dict.fromkeys(concurrency_values))
+    max_tokens_values = list(dict.fromkeys(max_tokens_values))
+    temperature_values = list(dict.fromkeys(temperature_values))
     for concurrency in concurrency_values:
         for max_tokens in max_tokens_values:
             for temperature in temperature_values:
-                grid.append(
-                    model_copy(
-                        base,
-                        update={
-                            "concurrency": concurrency,
-                            "max_tokens": max_tokens,
-                            "temperature": temperature,
-                        },
-                    )
-                )
-    return grid
+                yield {
+                    **base_values,
+                    "concurrency": concurrency,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                }
@@ -0,0 +1,145 @@
+"""Stale-while-revalidate cache for provider model catalogs."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .schemas import ModelInfo
+from .serialization import dumps as json_dumps, dumps_sorted, loads as json_loads
+from .utils import model_dump
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_MAX_ENTRIES = 256
+
+
+class CatalogCache:
+    """Caches catalog lookups per provider namespace for ``ttl_s`` seconds.
+
+    Expired entries are kept and served while a single background task refreshes
+    them, so only the very first lookup of a key waits on the upstream API. With a
+    ``directory`` entries are also written to disk and survive restarts; a file's
+    modification time records when it was fetched.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float,
+        directory: Optional[Path] = None,
+        max_entries: int = CATALOG_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_s = ttl_s
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, List[ModelInfo]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._refreshing: Dict[Tuple[str, str], asyncio.Task[None]] = {}
+
+    @staticmethod
+    def key_for(params: object) -> str:
+        # Built the same way as PromptCache.make_key.
+        return hashlib.blake2b(dumps_sorted(params), digest_size=16).hexdigest()
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[List[ModelInfo]]],
+    ) -> List[ModelInfo]:
+        """Return cached models, revalidating stale ones in the background."""
+        if self.ttl_s <= 0:
+            return await fetch()
+
+        entry = self._lookup(namespace, key)
+        if entry is not None:
+            fetched_at, models = entry
+            if time.monotonic() - fetched_at >= self.ttl_s:
+                self._revalidate(namespace, key, fetch)
+            return list(models)
+
+        generation = self._generations.get(namespace, 0)
+        models = await fetch()
+        self._store(namespace, key, models, generation)
+        return models
+
+    def invalidate(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == namespace]:
+            del self._entries[cache_key]
+        if self.directory is not None:
+            for path in self.directory.glob(f"{namespace}_*.json"):
+                path.unlink(missing_ok=True)
+
+    def _lookup(self, namespace: str, key: str) -> Optional[Tuple[float, List[ModelInfo]]]:
+        entry = self._entries.get((namespace, key))
+        if entry is None and self.directory is not None:
+            entry = self._load(namespace, key)
+            if entry is not None:
+                self._remember(namespace, key, entry)
+        return entry
+
+    def _revalidate(
+        self, namespace: str, key: str, fetch: Callable[[], Awaitable[List[ModelInfo]]]
+    ) -> None:
+        cache_key = (namespace, key)
+        if cache_key in self._refreshing:
+            return
+        generation = self._generations.get(namespace, 0)
+
+        async def refresh() -> None:
+            try:
+                self._store(namespace, key, await fetch(), generation)
+            except Exception as exc:  # noqa: BLE001 - keep serving the stale entry
+                logger.warning(
+                    "Could not refresh %s catalog, serving cached copy: %s", namespace, exc
+                )
+            finally:
+                self._refreshing.pop(cache_key, None)
+
+        self._refreshing[cache_key] = asyncio.create_task(refresh())
+
+    def _store(self, namespace: str, key: str, models: List[ModelInfo], generation: int) -> None:
+        if generation != self._generations.get(namespace, 0):
+            # The namespace was invalidated while this fetch was in flight.
+            return
+        self._remember(namespace, key, (time.monotonic(), list(models)))
+        if self.directory is not None:
+            self._save(namespace, key, models)
+
+    def _remember(self, namespace: str, key: str, entry: Tuple[float, List[ModelInfo]]) -> None:
+        self._entries.pop((namespace, key), None)
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first entry is the oldest.
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[(namespace, key)] = entry
+
+    def _path(self, namespace: str, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{namespace}_{key}.json"
+
+    def _load(self, namespace: str, key: str) -> Optional[Tuple[float, List[ModelInfo]]]:
+        path = self._path(namespace, key)
+        try:
+            age_s = time.time() - path.stat().st_mtime
+            models = [ModelInfo(**item) for item in json_loads(path.read_bytes())]
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Ignoring unreadable catalog cache %s: %s", path, exc)
+            return None
+        return time.monotonic() - max(age_s, 0.0), models
+
+    def _save(self, namespace: str, key: str, models: List[ModelInfo]) -> None:
+        path = self._path(namespace, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(json_dumps([model_dump(model) for model in models]))
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Could not persist catalog cache to %s: %s", path, exc)
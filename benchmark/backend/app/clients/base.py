@@ -3,9 +3,13 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import random
 import time
+from array import array
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 
 try:
     import httpx
@@ -19,7 +23,32 @@ except ImportError:  # pragma: no cover - fallback for environments without http
 
     httpx = _HttpxProxy()  # type: ignore
 
+try:  # HTTP/2 support in httpx requires the optional h2 package
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
 from ..schemas import BackendSpecificParameters, BenchmarkParameters
+from ..serialization import JSONDecodeError, loads as json_loads
+
+
+# SSE event names whose payloads are backend telemetry rather than generated tokens.
+TELEMETRY_EVENTS = frozenset({"telemetry", "log", "metrics"})
+
+# Request bodies are serialized up front and sent as raw ``content``.
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# SSE line markers, matched against raw bytes in the streaming hot loop.
+_SSE_COMMENT = b":"
+_SSE_EVENT = b"event:"
+_SSE_DATA = b"data:"
+_SSE_DONE = b"[DONE]"
+
+# Response keys that may carry a generated token count, in priority order.
+_TOKEN_COUNT_KEYS = ("tokens", "num_tokens", "token_count", "tokens_predicted", "eval_count")
+_USAGE_TOKEN_KEYS = ("total_tokens", "completion_tokens")
 
 
 @dataclass(slots=True)
@@ -27,14 +56,56 @@ class RequestMetrics:
     latency_ms: float
     ttft_ms: float
     tokens_generated: int
-    completion: str
-    raw_response: Dict[str, Any]
+    completion: str = ""
+    raw_response: Optional[Dict[str, Any]] = None
     avg_inter_token_latency_ms: float = 0.0
+    # Processing time reported by the backend itself (llama.cpp ``timings``),
+    # kept alongside the client-side ``latency_ms`` rather than replacing it.
+    server_latency_ms: Optional[float] = None
+
+
+class TokenTimer:
+    """Token arrival clock for one streamed request.
+
+    Timestamps are integer ``perf_counter_ns`` readings and gaps are kept in a
+    compact ``array('q')``, so the per-token path allocates no floats; the
+    conversion to milliseconds happens once in :meth:`finish`.
+    """
+
+    __slots__ = ("start_ns", "first_token_ns", "_previous_ns", "_deltas_ns")
+
+    def __init__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+        self.first_token_ns: Optional[int] = None
+        self._previous_ns = 0
+        self._deltas_ns = array("q")
+
+    def mark_token(self) -> None:
+        now = time.perf_counter_ns()
+        if self.first_token_ns is None:
+            self.first_token_ns = now
+        else:
+            self._deltas_ns.append(now - self._previous_ns)
+        self._previous_ns = now
+
+    def finish(self) -> Tuple[float, float, float]:
+        """Return ``(latency_ms, ttft_ms, avg_inter_token_latency_ms)``."""
+        latency_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        if self.first_token_ns is None:
+            ttft_ms = latency_ms
+        else:
+            ttft_ms = (self.first_token_ns - self.start_ns) / 1e6
+        deltas = self._deltas_ns
+        avg_inter_token_latency_ms = sum(deltas) / len(deltas) / 1e6 if deltas else 0.0
+        return latency_ms, ttft_ms, avg_inter_token_latency_ms
 
 
 class BackendClient(abc.ABC):
     """Abstract interface for provider specific clients."""
 
+    # Inexpensive endpoint requested to open pooled connections before timing.
+    pool_warmup_path = "/v1/models"
+
     def __init__(
         self,
         base_url: str,
@@ -49,29 +120,76 @@ class BackendClient(abc.ABC):
         self.parameters = parameters
         self.backend_parameters = backend_parameters
         self.timeout = timeout
+        self._timeout = make_timeout(timeout)
         self.api_key = api_key
+        # The API key is fixed for the client's lifetime, so headers are built once.
+        headers = dict(JSON_HEADERS)
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._request_headers = headers
+        self._build_payload_templates()
 
     async def warmup(self, prompt: str, client: httpx.AsyncClient) -> None:
-        """Execute a warm-up inference that is not included in measurements."""
-        for _ in range(self.parameters.warmup_requests):
-            await self._generate(prompt=prompt, client=client)
+        """Execute warm-up inferences that are not included in measurements.
 
-    async def generate(self, prompt: str, client: httpx.AsyncClient) -> RequestMetrics:
+        Warm-ups run up to ``concurrency`` at a time, so the warm-up phase lasts
+        roughly as long as its slowest request rather than the sum of all of them.
+        """
+        warmup_requests = self.parameters.warmup_requests
+        if not warmup_requests:
+            return
+        semaphore = asyncio.Semaphore(min(warmup_requests, self.parameters.concurrency))
+
+        async def _warmup_once() -> None:
+            async with semaphore:
+                await self._generate(prompt=prompt, client=client)
+
+        await asyncio.gather(*(_warmup_once() for _ in range(warmup_requests)))
+
+    def _headers(self) -> Dict[str, str]:
+        return self._request_headers
+
+    def update_parameters(self, parameters: BenchmarkParameters) -> None:
+        """Swap in the parameters of another sweep combination without rebuilding."""
+        self.parameters = parameters
+        self._build_payload_templates()
+
+    def _build_payload_templates(self) -> None:
+        """Assemble the prompt-independent part of each request body once.
+
+        Subclasses store their templates as attributes and merge the prompt into
+        a copy per request. Templates must be replaced rather than mutated so
+        shallow copies of a client (used by parallel sweeps) never observe each
+        other's parameters.
+        """
+
+    async def warm_pool(self, client: httpx.AsyncClient, connections: int) -> None:
+        """Open ``connections`` pooled connections so handshakes are not measured."""
+        url = f"{self.base_url}{self.pool_warmup_path}"
+        # Failures are irrelevant here: any response leaves a warm connection behind.
+        await asyncio.gather(
+            *(client.get(url, timeout=self._timeout) for _ in range(connections)),
+            return_exceptions=True,
+        )
+
+    async def generate(
+        self, prompt: str, client: httpx.AsyncClient, *, capture_completion: bool = False
+    ) -> RequestMetrics:
+        """Measure one request; the completion text is only kept when requested."""
         start = time.perf_counter()
         response = await self._generate(prompt=prompt, client=client)
-        end = time.perf_counter()
-
-        latency_ms = (end - start) * 1000.0
+        latency_ms = (time.perf_counter() - start) * 1000.0
         ttft_ms = self._extract_ttft(response, latency_ms)
         tokens_generated = self._extract_token_count(response)
-        completion = self._extract_completion_text(response)
+        completion = self._extract_completion_text(response) if capture_completion else ""
 
         return RequestMetrics(
             latency_ms=latency_ms,
             ttft_ms=ttft_ms,
             tokens_generated=tokens_generated,
             completion=completion,
-            raw_response=response,
+            raw_response=response if self.parameters.keep_raw_responses else None,
+            server_latency_ms=self._extract_server_latency(response),
         )
 
     @abc.abstractmethod
@@ -79,22 +197,16 @@ class BackendClient(abc.ABC):
         raise NotImplementedError
 
     def _extract_token_count(self, response: Dict[str, Any]) -> int:
-        candidates = [
-            response.get("tokens"),
-            response.get("num_tokens"),
-            response.get("token_count"),
-            response.get("tokens_predicted"),
-            response.get("eval_count"),
-        ]
-        if "usage" in response:
-            usage = response["usage"]
-            candidates.extend([
-                usage.get("total_tokens"),
-                usage.get("completion_tokens"),
-            ])
-        for candidate in candidates:
+        for key in _TOKEN_COUNT_KEYS:
+            candidate = response.get(key)
             if isinstance(candidate, int):
                 return candidate
+        usage = response.get("usage")
+        if isinstance(usage, dict):
+            for key in _USAGE_TOKEN_KEYS:
+                candidate = usage.get(key)
+                if isinstance(candidate, int):
+                    return candidate
         return 0
 
     def _extract_completion_text(self, response: Dict[str, Any]) -> str:
@@ -115,31 +227,57 @@ class BackendClient(abc.ABC):
                             return content
         return ""
 
-    def _extract_stream_text(self, chunk: Dict[str, Any]) -> str:
-        if "choices" in chunk and isinstance(chunk["choices"], list):
-            for choice in chunk["choices"]:
+    def _extract_stream_fields(self, chunk: Dict[str, Any]) -> Tuple[str, int]:
+        """Return ``(text, token_count)`` for one streamed chunk in a single call.
+
+        Every key is looked up once with ``get`` and the text search stops at the
+        first match, so the per-token path does one descent of the chunk.
+        """
+        text = ""
+        choices = chunk.get("choices")
+        if isinstance(choices, list):
+            for choice in choices:
                 if not isinstance(choice, dict):
                     continue
                 delta = choice.get("delta")
                 if isinstance(delta, dict):
                     content = delta.get("content")
                     if isinstance(content, str):
-                        return content
+                        text = content
+                        break
                 message = choice.get("message")
                 if isinstance(message, dict):
                     content = message.get("content")
                     if isinstance(content, str):
-                        return content
-                text = choice.get("text")
-                if isinstance(text, str):
-                    return text
-        content = chunk.get("content")
-        if isinstance(content, str):
-            return content
-        response = chunk.get("response")
-        if isinstance(response, str):
-            return response
-        return ""
+                        text = content
+                        break
+                choice_text = choice.get("text")
+                if isinstance(choice_text, str):
+                    text = choice_text
+                    break
+        if not text:
+            content = chunk.get("content")
+            if isinstance(content, str):
+                text = content
+            else:
+                response = chunk.get("response")
+                if isinstance(response, str):
+                    text = response
+        return text, self._extract_token_count(chunk)
+
+    def _extract_server_latency(self, response: Dict[str, Any]) -> Optional[float]:
+        """Return the server-reported processing time, if the backend provides one."""
+        candidate = response.get("latency_ms")
+        if isinstance(candidate, (int, float)):
+            return float(candidate)
+        timings = response.get("timings")
+        if isinstance(timings, dict):
+            # llama.cpp reports prompt processing and generation time separately.
+            prompt_ms = timings.get("prompt_ms")
+            predicted_ms = timings.get("predicted_ms")
+            if isinstance(prompt_ms, (int, float)) and isinstance(predicted_ms, (int, float)):
+                return float(prompt_ms + predicted_ms)
+        return None
 
     def _extract_ttft(self, response: Dict[str, Any], default: float) -> float:
         candidate = response.get("ttft_ms")
@@ -159,20 +297,174 @@ class BackendClient(abc.ABC):
         return default
 
 
-async def request_with_retry(
-    request_callable,
+# Idle connections survive between sweep combinations instead of the httpx
+# default of five seconds.
+KEEPALIVE_EXPIRY_S = 60.0
+# Connection setup should fail fast on a dead backend instead of consuming the
+# generation budget, which only applies to reading the response.
+CONNECT_TIMEOUT_S = 5.0
+WRITE_TIMEOUT_S = 10.0
+
+
+def make_timeout(timeout: float) -> httpx.Timeout:
+    """Split a generation budget into per-phase httpx timeouts.
+
+    ``timeout`` bounds reading a response and waiting for a pooled connection;
+    connecting and writing use short fixed budgets so a dead backend fails in
+    seconds and can be retried instead of consuming the whole budget.
+    """
+    return httpx.Timeout(
+        connect=CONNECT_TIMEOUT_S,
+        read=timeout,
+        write=WRITE_TIMEOUT_S,
+        pool=timeout,
+    )
+
+
+def make_http_client(
     *,
-    retries: int = 2,
+    timeout: float,
+    max_connections: int,
+    max_keepalive: int,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """Build the pooled HTTP client that backend clients send requests through.
+
+    Every entrypoint that drives a backend should obtain its client here so all
+    requests share one connection pool with keep-alive sized to the workload.
+    ``timeout`` is split into phases by :func:`make_timeout`. HTTP/2 is used
+    whenever ``h2`` is installed, so concurrent streams to one backend multiplex
+    over a single connection; it is negotiated via ALPN, so HTTP/1.1-only
+    servers keep working.
+    """
+    return httpx.AsyncClient(
+        http2=http2 and HTTP2_AVAILABLE,
+        timeout=make_timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=KEEPALIVE_EXPIRY_S,
+        ),
+    )
+
+
+async def aiter_byte_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield the lines of a streamed response as bytes, without decoding to str."""
+    buffer = bytearray()
+    async for data in response.aiter_bytes():
+        buffer.extend(data)
+        start = 0
+        while (newline := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start:newline])
+            start = newline + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def aiter_sse_data(response: httpx.Response) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    """Yield ``(telemetry_event, payload)`` for each JSON ``data:`` line of an SSE stream.
+
+    Lines are matched and sliced as bytes and handed straight to the JSON parser.
+    ``telemetry_event`` names the enclosing telemetry event, or is ``None`` for
+    regular token chunks. Comments, ``[DONE]`` and undecodable lines are skipped.
+    """
+    telemetry_event: Optional[str] = None
+    async for raw_line in aiter_byte_lines(response):
+        line = raw_line.strip()
+        if not line:
+            # A blank line terminates the current event.
+            telemetry_event = None
+            continue
+        if line.startswith(_SSE_COMMENT):
+            continue
+        if line.startswith(_SSE_EVENT):
+            # Classify the event once here rather than on every data line.
+            event_name = line[len(_SSE_EVENT) :].strip().decode("utf-8", "replace")
+            telemetry_event = event_name if event_name.lower() in TELEMETRY_EVENTS else None
+            continue
+        if line.startswith(_SSE_DATA):
+            line = line[len(_SSE_DATA) :].strip()
+        if not line or line == _SSE_DONE:
+            continue
+        try:
+            payload = json_loads(line)
+        except JSONDecodeError:
+            continue
+        yield telemetry_event, payload
+
+
+# Statuses worth retrying: rate limiting and transient server failures. Any
+# other HTTP error status is treated as permanent and raised immediately.
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_DELAY_S = 30.0
+RETRY_JITTER = 0.5
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_delay(error: Exception, attempt: int, backoff: float) -> Optional[float]:
+    """Return how long to wait before retry ``attempt``, or ``None`` to give up.
+
+    Only transport failures and retryable HTTP statuses are retried; anything
+    else (a parse error, a bug in the caller) is raised straight away.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        retry_after = _retry_after_seconds(error.response)
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_DELAY_S)
+    elif not isinstance(error, httpx.TransportError):
+        return None
+    delay = min(MAX_RETRY_DELAY_S, backoff * 2 ** (attempt - 1))
+    return delay * (1.0 + random.random() * RETRY_JITTER)
+
+
+async def request_with_retry(
+    request_callable: Callable[..., Awaitable[Any]],
+    *args: Any,
+    retries: int = 3,
     backoff: float = 0.5,
+    **kwargs: Any,
 ) -> Any:
-    last_error: Optional[Exception] = None
-    for attempt in range(retries + 1):
+    """Await ``request_callable(*args, **kwargs)``, retrying failures with backoff.
+
+    Transport errors and 429/5xx responses are retried with jittered exponential
+    backoff, honouring ``Retry-After`` when the server sends one; other HTTP error
+    statuses and non-HTTP exceptions fail immediately. Arguments are forwarded
+    rather than captured in a closure so callers can pass a bound method without
+    allocating a new function per request.
+    """
+    # Fast path: the first attempt succeeds for nearly every request, so the
+    # retry bookkeeping is only entered once it has failed.
+    try:
+        return await request_callable(*args, **kwargs)
+    except Exception as exc:  # noqa: BLE001 classified by _retry_delay
+        last_error = exc
+    for attempt in range(1, retries + 1):
+        delay = _retry_delay(last_error, attempt, backoff)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
         try:
-            return await request_callable()
-        except Exception as exc:  # noqa: BLE001 intentionally broad to retry
+            return await request_callable(*args, **kwargs)
+        except Exception as exc:  # noqa: BLE001 classified by _retry_delay
             last_error = exc
-            if attempt >= retries:
-                raise
-            await asyncio.sleep(backoff * (attempt + 1))
-    if last_error:
-        raise last_error
+    raise last_error
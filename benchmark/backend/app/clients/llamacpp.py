@@ -1,9 +1,6 @@
 """llama.cpp HTTP server client implementation."""
 from __future__ import annotations
 
-import json
-import time
-from statistics import mean
 from typing import Any, Dict, List, Optional
 
 try:
@@ -11,43 +8,55 @@ try:
 except ImportError:  # pragma: no cover
     from .base import httpx  # type: ignore  # fallback proxy
 
-from .base import BackendClient, RequestMetrics, request_with_retry
+from ..serialization import dumps as json_dumps
+from .base import BackendClient, RequestMetrics, TokenTimer, aiter_sse_data, request_with_retry
 
 
 class LlamaCppClient(BackendClient):
-    def _headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+    pool_warmup_path = "/health"
 
-    async def _send_chat_request(
-        self,
-        prompt: str,
-        client: httpx.AsyncClient,
-        headers: Dict[str, str],
-    ) -> Dict[str, Any]:
-        url = f"{self.base_url}/v1/chat/completions"
-        payload: Dict[str, Any] = {
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._chat_url = f"{self.base_url}/v1/chat/completions"
+        self._legacy_url = f"{self.base_url}/completion"
+
+    def _build_payload_templates(self) -> None:
+        chat_payload: Dict[str, Any] = {
             "model": self.model_name,
-            "messages": [{"role": "user", "content": prompt}],
             "max_tokens": self.parameters.max_tokens,
             "temperature": self.parameters.temperature,
             "top_p": self.parameters.top_p,
             "stream": False,
+            "options": {"repeat_penalty": self.parameters.repetition_penalty},
         }
-        options: Dict[str, Any] = {
+        legacy_payload: Dict[str, Any] = {
+            "n_predict": self.parameters.max_tokens,
+            "temperature": self.parameters.temperature,
+            "top_p": self.parameters.top_p,
             "repeat_penalty": self.parameters.repetition_penalty,
+            "stream": False,
         }
-        # Avoid sending empty options object to servers that do not support it.
-        if options:
-            payload["options"] = options
+        self._chat_template = chat_payload
+        self._chat_stream_template = {**chat_payload, "stream": True}
+        self._legacy_template = legacy_payload
+        self._legacy_stream_template = {**legacy_payload, "stream": True}
+
+    async def _send_chat_request(
+        self,
+        prompt: str,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+    ) -> Dict[str, Any]:
+        url = self._chat_url
+        body = json_dumps(
+            {**self._chat_template, "messages": [{"role": "user", "content": prompt}]}
+        )
 
         response = await client.post(
             url,
-            json=payload,
+            content=body,
             headers=headers,
-            timeout=self.timeout,
+            timeout=self._timeout,
         )
         response.raise_for_status()
         data = response.json()
@@ -61,21 +70,14 @@ class LlamaCppClient(BackendClient):
         client: httpx.AsyncClient,
         headers: Dict[str, str],
     ) -> Dict[str, Any]:
-        url = f"{self.base_url}/completion"
-        payload: Dict[str, Any] = {
-            "prompt": prompt,
-            "n_predict": self.parameters.max_tokens,
-            "temperature": self.parameters.temperature,
-            "top_p": self.parameters.top_p,
-            "repeat_penalty": self.parameters.repetition_penalty,
-            "stream": False,
-        }
+        url = self._legacy_url
+        body = json_dumps({**self._legacy_template, "prompt": prompt})
 
         response = await client.post(
             url,
-            json=payload,
+            content=body,
             headers=headers,
-            timeout=self.timeout,
+            timeout=self._timeout,
         )
         response.raise_for_status()
         data = response.json()
@@ -84,32 +86,41 @@ class LlamaCppClient(BackendClient):
         raise ValueError("Unexpected response from llama.cpp legacy endpoint")
 
     async def _generate(self, prompt: str, client: httpx.AsyncClient) -> Dict[str, Any]:
-        headers = self._headers()
-
-        async def _send() -> Dict[str, Any]:
-            try:
-                return await self._send_chat_request(prompt, client, headers)
-            except httpx.HTTPStatusError as exc:
-                if exc.response.status_code in {404, 405}:  # pragma: no cover - fallback path
-                    return await self._send_legacy_request(prompt, client, headers)
-                raise
+        return await request_with_retry(self._send_request, prompt, client, self._headers())
 
-        return await request_with_retry(_send)
+    async def _send_request(
+        self,
+        prompt: str,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+    ) -> Dict[str, Any]:
+        try:
+            return await self._send_chat_request(prompt, client, headers)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in {404, 405}:  # pragma: no cover - fallback path
+                return await self._send_legacy_request(prompt, client, headers)
+            raise
 
-    async def generate(self, prompt: str, client: httpx.AsyncClient) -> RequestMetrics:
+    async def generate(
+        self, prompt: str, client: httpx.AsyncClient, *, capture_completion: bool = False
+    ) -> RequestMetrics:
         if not self.parameters.stream:
-            return await super().generate(prompt, client)
+            return await super().generate(prompt, client, capture_completion=capture_completion)
 
         headers = self._headers()
         try:
-            return await self._stream_generate(prompt, client, headers, use_chat=True)
+            return await self._stream_generate(
+                prompt, client, headers, use_chat=True, capture_completion=capture_completion
+            )
         except httpx.HTTPStatusError as exc:
             if exc.response.status_code in {404, 405}:  # pragma: no cover - fallback path
-                return await self._stream_generate(prompt, client, headers, use_chat=False)
+                return await self._stream_generate(
+                    prompt, client, headers, use_chat=False, capture_completion=capture_completion
+                )
             raise
         except ValueError:
             # Fall back to a non-streaming measurement if the server cannot stream
-            return await super().generate(prompt, client)
+            return await super().generate(prompt, client, capture_completion=capture_completion)
 
     async def _stream_generate(
         self,
@@ -117,111 +128,74 @@ class LlamaCppClient(BackendClient):
         client: httpx.AsyncClient,
         headers: Dict[str, str],
         use_chat: bool,
+        capture_completion: bool,
     ) -> RequestMetrics:
         if use_chat:
-            url = f"{self.base_url}/v1/chat/completions"
-            payload: Dict[str, Any] = {
-                "model": self.model_name,
+            url = self._chat_url
+            payload = {
+                **self._chat_stream_template,
                 "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": self.parameters.max_tokens,
-                "temperature": self.parameters.temperature,
-                "top_p": self.parameters.top_p,
-                "stream": True,
-            }
-            options: Dict[str, Any] = {
-                "repeat_penalty": self.parameters.repetition_penalty,
             }
-            if options:
-                payload["options"] = options
             endpoint = "chat"
         else:
-            url = f"{self.base_url}/completion"
-            payload = {
-                "prompt": prompt,
-                "n_predict": self.parameters.max_tokens,
-                "temperature": self.parameters.temperature,
-                "top_p": self.parameters.top_p,
-                "repeat_penalty": self.parameters.repetition_penalty,
-                "stream": True,
-            }
+            url = self._legacy_url
+            payload = {**self._legacy_stream_template, "prompt": prompt}
             endpoint = "legacy"
+        body = json_dumps(payload)
 
-        start = time.perf_counter()
-        completion_chunks: List[str] = []
+        timer = TokenTimer()
+        completion_buffer = bytearray()
+        # Chunks are only retained when raw responses are kept.
+        keep_raw = self.parameters.keep_raw_responses
         raw_chunks: List[Dict[str, Any]] = []
-        first_token_timestamp: Optional[float] = None
-        previous_token_timestamp: Optional[float] = None
-        inter_token_deltas: List[float] = []
+        received = False
         token_counter = 0
 
         try:
             async with client.stream(
                 "POST",
                 url,
-                json=payload,
+                content=body,
                 headers=headers,
-                timeout=self.timeout,
+                timeout=self._timeout,
             ) as response:
                 response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if line.startswith("data:"):
-                        line = line[5:].strip()
-                    if not line or line == "[DONE]":
-                        continue
-                    try:
-                        chunk = json.loads(line)
-                    except json.JSONDecodeError:
+                async for telemetry_event, chunk in aiter_sse_data(response):
+                    if telemetry_event or not isinstance(chunk, dict):
                         continue
 
-                    if not isinstance(chunk, dict):
-                        continue
-
-                    raw_chunks.append(chunk)
-                    text = self._extract_stream_text(chunk)
+                    received = True
+                    if keep_raw:
+                        raw_chunks.append(chunk)
+                    text, tokens_hint = self._extract_stream_fields(chunk)
                     if text:
-                        completion_chunks.append(text)
-                        now = time.perf_counter()
-                        if first_token_timestamp is None:
-                            first_token_timestamp = now
-                            previous_token_timestamp = now
-                        else:
-                            if previous_token_timestamp is not None:
-                                inter_token_deltas.append((now - previous_token_timestamp) * 1000.0)
-                            previous_token_timestamp = now
+                        if capture_completion:
+                            completion_buffer += text.encode("utf-8")
+                        timer.mark_token()
                         # Fall back to counting chunks if the backend does not report tokens
                         token_counter += 1
 
-                    tokens_hint = self._extract_token_count(chunk)
                     if tokens_hint:
                         token_counter = max(token_counter, tokens_hint)
         except (httpx.ReadError, httpx.RemoteProtocolError) as exc:
-            if not raw_chunks:
+            if not received:
                 raise ValueError("Empty streaming response") from exc
             # Allow partial streams from llama.cpp when the connection closes early
             pass
 
-        if not raw_chunks:
+        if not received:
             raise ValueError("Empty streaming response")
 
-        end = time.perf_counter()
-        latency_ms = (end - start) * 1000.0
-        if first_token_timestamp is not None:
-            ttft_ms = (first_token_timestamp - start) * 1000.0
-        else:
-            ttft_ms = latency_ms
-        avg_inter_token_latency_ms = mean(inter_token_deltas) if inter_token_deltas else 0.0
-        completion_text = "".join(completion_chunks)
-
-        raw_response: Dict[str, Any] = {
-            "chunks": raw_chunks,
-            "endpoint": endpoint,
-            "stream": True,
-        }
+        latency_ms, ttft_ms, avg_inter_token_latency_ms = timer.finish()
+        completion_text = completion_buffer.decode("utf-8")
+
+        raw_response: Optional[Dict[str, Any]] = None
+        if keep_raw:
+            raw_response = {
+                "chunks": raw_chunks,
+                "endpoint": endpoint,
+                "stream": True,
+            }
 
         return RequestMetrics(
             latency_ms=latency_ms,
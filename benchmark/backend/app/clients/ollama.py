@@ -1,9 +1,6 @@
 """Ollama client implementation."""
 from __future__ import annotations
 
-import json
-import time
-from statistics import mean
 from typing import Any, Dict, List, Optional
 
 try:
@@ -11,15 +8,24 @@ try:
 except ImportError:  # pragma: no cover
     from .base import httpx  # type: ignore  # fallback proxy
 
-from .base import BackendClient, RequestMetrics, request_with_retry
+from ..serialization import JSONDecodeError, dumps as json_dumps, loads as json_loads
+from .base import (
+    JSON_HEADERS,
+    BackendClient,
+    RequestMetrics,
+    TokenTimer,
+    aiter_byte_lines,
+    request_with_retry,
+)
 
 
 class OllamaClient(BackendClient):
-    async def _generate(self, prompt: str, client: httpx.AsyncClient) -> Dict[str, Any]:
-        url = f"{self.base_url}/api/generate"
+    pool_warmup_path = "/api/tags"
+
+    def _build_payload_templates(self) -> None:
+        self._url = f"{self.base_url}/api/generate"
         payload: Dict[str, Any] = {
             "model": self.model_name,
-            "prompt": prompt,
             "stream": False,
             "keep_alive": self.backend_parameters.ollama_keep_alive,
             "options": {
@@ -28,76 +34,75 @@ class OllamaClient(BackendClient):
                 "num_predict": self.parameters.max_tokens,
             },
         }
+        self._payload_template = payload
+        self._stream_payload_template = {**payload, "stream": True}
 
-        async def _send() -> Dict[str, Any]:
-            response = await client.post(url, json=payload, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            if "response" in data and isinstance(data["response"], str):
-                return data
-            # Some Ollama deployments stream tokens. Aggregate if needed.
-            if isinstance(data, dict):
-                return data
-            raise ValueError("Unexpected response from Ollama")
-
-        return await request_with_retry(_send)
+    async def _generate(self, prompt: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+        body = json_dumps({**self._payload_template, "prompt": prompt})
+        return await request_with_retry(self._post_generate, client, body)
 
-    async def generate(self, prompt: str, client: httpx.AsyncClient) -> RequestMetrics:
+    async def _post_generate(self, client: httpx.AsyncClient, body: bytes) -> Dict[str, Any]:
+        response = await client.post(
+            self._url, content=body, headers=JSON_HEADERS, timeout=self._timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        if "response" in data and isinstance(data["response"], str):
+            return data
+        # Some Ollama deployments stream tokens. Aggregate if needed.
+        if isinstance(data, dict):
+            return data
+        raise ValueError("Unexpected response from Ollama")
+
+    async def generate(
+        self, prompt: str, client: httpx.AsyncClient, *, capture_completion: bool = False
+    ) -> RequestMetrics:
         if not self.parameters.stream:
-            return await super().generate(prompt, client)
+            return await super().generate(prompt, client, capture_completion=capture_completion)
 
         try:
-            return await self._stream_generate(prompt, client)
+            return await self._stream_generate(prompt, client, capture_completion)
         except ValueError:
-            return await super().generate(prompt, client)
+            return await super().generate(prompt, client, capture_completion=capture_completion)
 
     async def _stream_generate(
-        self, prompt: str, client: httpx.AsyncClient
+        self, prompt: str, client: httpx.AsyncClient, capture_completion: bool
     ) -> RequestMetrics:
-        url = f"{self.base_url}/api/generate"
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": True,
-            "keep_alive": self.backend_parameters.ollama_keep_alive,
-            "options": {
-                "temperature": self.parameters.temperature,
-                "top_p": self.parameters.top_p,
-                "num_predict": self.parameters.max_tokens,
-            },
-        }
+        url = self._url
+        body = json_dumps({**self._stream_payload_template, "prompt": prompt})
 
-        start = time.perf_counter()
-        completion_chunks: List[str] = []
+        timer = TokenTimer()
+        completion_buffer = bytearray()
+        # Chunks are only retained when raw responses are kept.
+        keep_raw = self.parameters.keep_raw_responses
         raw_chunks: List[Dict[str, Any]] = []
+        received = False
         telemetry_events: List[Dict[str, Any]] = []
-        first_token_timestamp: Optional[float] = None
-        previous_token_timestamp: Optional[float] = None
-        inter_token_deltas: List[float] = []
         token_counter = 0
 
         async with client.stream(
             "POST",
             url,
-            json=payload,
-            timeout=self.timeout,
+            content=body,
+            headers=JSON_HEADERS,
+            timeout=self._timeout,
         ) as response:
             response.raise_for_status()
-            async for raw_line in response.aiter_lines():
-                if raw_line is None:
-                    continue
+            async for raw_line in aiter_byte_lines(response):
                 line = raw_line.strip()
                 if not line:
                     continue
                 try:
-                    chunk = json.loads(line)
-                except json.JSONDecodeError:
+                    chunk = json_loads(line)
+                except JSONDecodeError:
                     continue
 
                 if not isinstance(chunk, dict):
                     continue
 
-                raw_chunks.append(chunk)
+                received = True
+                if keep_raw:
+                    raw_chunks.append(chunk)
                 if chunk.get("event") in {"metrics", "telemetry"} and "data" in chunk:
                     telemetry_events.append(chunk)
                     continue
@@ -109,20 +114,13 @@ class OllamaClient(BackendClient):
                 if isinstance(metrics_payload, dict):
                     telemetry_events.append({"event": "metrics", "data": metrics_payload})
 
-                text = self._extract_stream_text(chunk)
+                text, tokens_hint = self._extract_stream_fields(chunk)
                 if text:
-                    completion_chunks.append(text)
-                    now = time.perf_counter()
-                    if first_token_timestamp is None:
-                        first_token_timestamp = now
-                        previous_token_timestamp = now
-                    else:
-                        if previous_token_timestamp is not None:
-                            inter_token_deltas.append((now - previous_token_timestamp) * 1000.0)
-                        previous_token_timestamp = now
+                    if capture_completion:
+                        completion_buffer += text.encode("utf-8")
+                    timer.mark_token()
                     token_counter += 1
 
-                tokens_hint = self._extract_token_count(chunk)
                 if tokens_hint:
                     token_counter = max(token_counter, tokens_hint)
 
@@ -132,23 +130,19 @@ class OllamaClient(BackendClient):
                     if metrics and isinstance(metrics, dict):
                         telemetry_events.append({"event": "metrics", "data": metrics})
 
-        if not raw_chunks:
+        if not received:
             raise ValueError("Empty streaming response from Ollama")
 
-        end = time.perf_counter()
-        latency_ms = (end - start) * 1000.0
-        if first_token_timestamp is not None:
-            ttft_ms = (first_token_timestamp - start) * 1000.0
-        else:
-            ttft_ms = latency_ms
-        avg_inter_token_latency_ms = mean(inter_token_deltas) if inter_token_deltas else 0.0
-        completion_text = "".join(completion_chunks)
-
-        raw_response: Dict[str, Any] = {
-            "chunks": raw_chunks,
-            "telemetry": telemetry_events,
-            "stream": True,
-        }
+        latency_ms, ttft_ms, avg_inter_token_latency_ms = timer.finish()
+        completion_text = completion_buffer.decode("utf-8")
+
+        raw_response: Optional[Dict[str, Any]] = None
+        if keep_raw:
+            raw_response = {
+                "chunks": raw_chunks,
+                "telemetry": telemetry_events,
+                "stream": True,
+            }
 
         return RequestMetrics(
             latency_ms=latency_ms,
@@ -2,28 +2,84 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Dict, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from pathlib import Path
 
+from .serialization import dumps as json_dumps, loads as json_loads
 from .settings import settings
 
 
-engine = create_engine(settings.database_url, future=True)
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _json_serializer(value: Any) -> str:
+    return json_dumps(value).decode("utf-8")
+
+
+# JSON columns (run parameters and metrics) are encoded with orjson when it is
+# installed instead of the stdlib json module.
+_JSON_OPTIONS = {"json_serializer": _json_serializer, "json_deserializer": json_loads}
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    if _is_sqlite(url):
+        # Sessions are opened from the event loop and from worker threads.
+        return {"connect_args": {"check_same_thread": False}, **_JSON_OPTIONS}
+    # Server databases get a pool sized for concurrent API workers; SQLite uses
+    # SQLAlchemy's default pool.
+    return {
+        **_JSON_OPTIONS,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _enable_sqlite_wal(dbapi_connection: Any, connection_record: Any) -> None:
+    """Let readers proceed while a benchmark run is writing results."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Sort/temp B-trees in memory and a 64 MiB page cache per connection;
+        # pooled connections keep the cache warm across requests.
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+    finally:
+        cursor.close()
+
+
+engine = create_engine(settings.database_url, future=True, **_engine_options(settings.database_url))
+if _is_sqlite(settings.database_url):
+    event.listen(engine, "connect", _enable_sqlite_wal)
 SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 Base = declarative_base()
 
 
 def create_all() -> None:
-    if settings.database_url.startswith("sqlite"):
+    if _is_sqlite(settings.database_url):
         db_path = settings.database_url.split("///")[-1]
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    from . import models  # noqa: F401 ensures models are registered
+    from . import models  # registers the models on Base
 
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, including any index added to them later.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    models.seed_counters(engine)
+    if _is_sqlite(settings.database_url):
+        # Refresh planner statistics (only for tables that need it) so SQLite
+        # picks the history index over a table scan.
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA optimize")
 
 
 @contextmanager
@@ -37,3 +93,4 @@ def get_session() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
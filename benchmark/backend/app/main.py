@@ -1,20 +1,32 @@
 """FastAPI application exposing benchmarking functionality."""
 from __future__ import annotations
 
+import gzip
+import hashlib
 import logging
 import os
-from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, List
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 
+from .benchmark import close_shared_clients
 from .database import create_all
 from .model_registry import ModelRegistryService, ModelRuntimeService
+from .models import format_timestamp
 from .schemas import (
+    AutoBenchmarkItem,
     AutoBenchmarkRequest,
     BackendMetadata,
     BenchmarkHistoryItem,
@@ -34,12 +46,25 @@ from .schemas import (
     OllamaPullRequest,
     PaginatedBenchmarkHistory,
 )
+from .serialization import dumps as json_dumps
 from .service import BenchmarkService
 from .settings import settings
+from .utils import model_construct, model_dump
+
+try:  # Optional dependency: orjson encodes responses several times faster
+    import orjson  # noqa: F401
+except ImportError:  # pragma: no cover - stdlib fallback
+    DefaultResponse = JSONResponse
+else:
+    DefaultResponse = ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.api_title, version=settings.api_version)
+app = FastAPI(
+    title=settings.api_title,
+    version=settings.api_version,
+    default_response_class=DefaultResponse,
+)
 
 frontend_dist_path = Path(settings.frontend_dist_path) if settings.frontend_dist_path else None
 frontend_index_path = (
@@ -64,10 +89,6 @@ model_registry = ModelRegistryService(settings=settings)
 runtime_service = ModelRuntimeService(settings=settings)
 
 
-def get_service() -> BenchmarkService:
-    return service
-
-
 @app.on_event("startup")
 async def startup() -> None:
     create_all()
@@ -86,6 +107,12 @@ async def startup() -> None:
         logger.info("Frontend dashboard available at %s", settings.frontend_base_url)
 
 
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await close_shared_clients()
+    await model_registry.aclose()
+
+
 @app.get("/", include_in_schema=False, response_model=None)
 async def root() -> FileResponse | RedirectResponse | dict:
     """Serve the dashboard when available, otherwise redirect or return JSON."""
@@ -102,13 +129,17 @@ async def root() -> FileResponse | RedirectResponse | dict:
     }
 
 
+_HEALTH_JSON = json_dumps({"status": "ok", "version": settings.api_version})
+
+
 @app.get("/health", summary="Service health probe")
-async def health_check() -> dict:
-    return {"status": "ok", "version": settings.api_version}
+async def health_check() -> Response:
+    # Kept async: the body is a constant, so a threadpool hop would cost more
+    # than the handler itself.
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
-@app.get("/api/backends", response_model=List[BackendMetadata])
-async def list_backends() -> List[BackendMetadata]:
+def _build_backend_catalog() -> List[BackendMetadata]:
     return [
         BackendMetadata(
             name="Ollama",
@@ -161,16 +192,68 @@ async def list_backends() -> List[BackendMetadata]:
     ]
 
 
+# The catalog only depends on settings, so it is validated and serialized once
+# at import instead of on every request.
+BACKENDS = _build_backend_catalog()
+_BACKENDS_JSON = json_dumps(jsonable_encoder(BACKENDS))
+_BACKENDS_JSON_GZ = gzip.compress(_BACKENDS_JSON, compresslevel=6, mtime=0)
+_BACKENDS_HEADERS = {
+    "ETag": f'"{hashlib.md5(_BACKENDS_JSON).hexdigest()}"',
+    "Cache-Control": "public, max-age=300",
+    "Vary": "Accept-Encoding",
+}
+_BACKENDS_GZ_HEADERS = {**_BACKENDS_HEADERS, "Content-Encoding": "gzip"}
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether ``Accept-Encoding`` allows gzip; ``gzip;q=0`` refuses it."""
+    wildcard = False
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.strip().lower()
+        if name in ("gzip", "x-gzip"):
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+@app.get("/api/backends", response_model=List[BackendMetadata])
+async def list_backends(request: Request) -> Response:
+    if _etag_matches(request, _BACKENDS_HEADERS["ETag"]):
+        return Response(status_code=304, headers=_BACKENDS_HEADERS)
+    if _accepts_gzip(request):
+        return Response(
+            content=_BACKENDS_JSON_GZ, media_type="application/json", headers=_BACKENDS_GZ_HEADERS
+        )
+    return Response(
+        content=_BACKENDS_JSON, media_type="application/json", headers=_BACKENDS_HEADERS
+    )
+
+
 @app.post(
     "/api/benchmarks",
     response_model=BenchmarkRunResponse,
     responses={404: {"model": ErrorResponse}},
 )
-async def schedule_benchmark(
-    request: BenchmarkRequest,
-    svc: BenchmarkService = Depends(get_service),
-) -> BenchmarkRunResponse:
-    run = await svc.schedule_run(request)
+async def schedule_benchmark(request: BenchmarkRequest) -> BenchmarkRunResponse:
+    run = await service.schedule_run(request)
     return BenchmarkRunResponse(id=run.id, status=run.status)
 
 
@@ -179,8 +262,8 @@ async def schedule_benchmark(
     response_model=BenchmarkHistoryItem,
     responses={404: {"model": ErrorResponse}},
 )
-async def get_benchmark(run_id: int, svc: BenchmarkService = Depends(get_service)) -> BenchmarkHistoryItem:
-    run = await svc.get_run(run_id)
+async def get_benchmark(run_id: int) -> BenchmarkHistoryItem:
+    run = await service.get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Benchmark run not found")
     return run
@@ -190,34 +273,55 @@ async def get_benchmark(run_id: int, svc: BenchmarkService = Depends(get_service
 async def list_benchmarks(
     limit: int = 20,
     offset: int = 0,
-    svc: BenchmarkService = Depends(get_service),
+    cursor: str | None = None,
 ) -> PaginatedBenchmarkHistory:
-    runs = await svc.list_runs(limit=limit, offset=offset)
-    total = await svc.count_runs()
-    return PaginatedBenchmarkHistory(runs=runs, total=total)
-
-
-@app.post("/api/benchmarks/auto", response_model=List[BenchmarkHistoryItem])
-async def auto_benchmark(
-    request: AutoBenchmarkRequest,
-    svc: BenchmarkService = Depends(get_service),
-) -> List[BenchmarkHistoryItem]:
-    results = await svc.run_auto(request)
-    history_items: List[BenchmarkHistoryItem] = []
-    for result in results:
-        history_items.append(
-            BenchmarkHistoryItem(
-                id=result.run_id,
-                provider=result.provider,
-                model_name=result.model_name,
-                status="completed",
-                created_at=datetime.utcnow().isoformat(),
-                completed_at=datetime.utcnow().isoformat(),
-                metrics=result.metrics,
-                error=None,
-            )
-        )
-    return history_items
+    try:
+        return await service.list_history(limit=limit, offset=offset, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.post(
+    "/api/benchmarks/auto",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def auto_benchmark(request: AutoBenchmarkRequest) -> StreamingResponse:
+    """Stream one NDJSON ``AutoBenchmarkItem`` per sweep combination as it completes.
+
+    A failure after streaming has begun ends the stream with an ``{"error": ...}`` row.
+    """
+    try:
+        sweep = service.prepare_auto(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    async def _iter_rows() -> AsyncIterator[bytes]:
+        try:
+            async for swept in service.run_auto(request, sweep):
+                result = swept.result
+                # Every field comes from a validated BenchmarkResult, so skip re-validation.
+                item = model_construct(
+                    AutoBenchmarkItem,
+                    id=result.run_id,
+                    provider=result.provider,
+                    model_name=result.model_name,
+                    status="completed",
+                    created_at=format_timestamp(swept.started_at),
+                    completed_at=format_timestamp(swept.completed_at),
+                    metrics=result.metrics,
+                    error=None,
+                    combination=swept.index,
+                    # Only the sampling parameters vary across the sweep.
+                    parameters=result.parameters["parameters"],
+                )
+                yield json_dumps(model_dump(item)) + b"\n"
+        except Exception as exc:
+            # The 200 status line has already been sent, so report it in-band.
+            logger.exception("Auto benchmark failed")
+            yield json_dumps({"error": str(exc) or type(exc).__name__}) + b"\n"
+
+    return StreamingResponse(_iter_rows(), media_type="application/x-ndjson")
 
 
 @app.get("/api/models/ollama", response_model=ModelListResponse)
@@ -262,6 +366,11 @@ async def pull_nim_model(request: NimPullRequest) -> ModelActionResponse:
     return await model_registry.pull_nim_model(request)
 
 
+@app.post("/api/models/nim/pull/batch", response_model=List[ModelActionResponse])
+async def pull_nim_models(requests: List[NimPullRequest]) -> List[ModelActionResponse]:
+    return await model_registry.pull_nim_models(requests)
+
+
 @app.post("/api/models/huggingface/search", response_model=ModelListResponse)
 async def search_huggingface_models(request: HuggingFaceSearchRequest) -> ModelListResponse:
     models = await model_registry.search_huggingface_models(request)
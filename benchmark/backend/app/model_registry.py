@@ -2,24 +2,46 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import bisect
+import hashlib
+import importlib.util
 import os
 import pathlib
 import shlex
 import shutil
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import attrgetter
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 import httpx
 from fastapi import HTTPException
 
 try:  # Optional dependency used for Hugging Face downloads
     from huggingface_hub import HfApi, snapshot_download
+    from huggingface_hub import constants as hf_constants
 except ImportError:  # pragma: no cover - optional dependency
     HfApi = None  # type: ignore
     snapshot_download = None  # type: ignore
-
+    hf_constants = None  # type: ignore
+
+# huggingface_hub's HTTP stack depends on its major version: requests before
+# 1.0, httpx in 1.x and httpx2 from 2.0. Their connection errors are only
+# retryable if they can be recognised, so each is imported when present.
+try:
+    import requests
+except ImportError:  # pragma: no cover - only installed with huggingface_hub<1.0
+    requests = None  # type: ignore
+
+try:
+    import httpx2
+except ImportError:  # pragma: no cover - only installed with huggingface_hub>=2.0
+    httpx2 = None  # type: ignore
+
+from .catalog_cache import CatalogCache
+from .clients.base import MAX_RETRY_DELAY_S, make_http_client, make_timeout, request_with_retry
+from .models import format_timestamp, utcnow
 from .schemas import (
     BenchmarkProvider,
     HuggingFaceDownloadRequest,
@@ -34,8 +56,40 @@ from .schemas import (
     NimSearchRequest,
     OllamaPullRequest,
 )
+from .serialization import dumps_pretty as json_dumps_pretty, loads as json_loads
 from .settings import Settings
-from .utils import model_dump
+from .utils import model_construct, model_dump
+
+# Catalog calls go to a handful of hosts (Ollama, NGC), so a small pool suffices.
+REGISTRY_MAX_CONNECTIONS = 32
+REGISTRY_TIMEOUT_S = 30.0
+OLLAMA_PULL_TIMEOUT_S = 600.0
+# Layer fetches are network bound, but each pull also loads the Docker daemon.
+NIM_PULL_CONCURRENCY = 4
+# Concurrent NGC catalog page requests, kept low to stay under its rate limits.
+NGC_PAGE_CONCURRENCY = 5
+# Threads kept for blocking Hugging Face calls, and the cap on concurrent CLI
+# subprocesses (docker, ngc).
+REGISTRY_EXECUTOR_WORKERS = 8
+MAX_CONCURRENT_COMMANDS = 8
+COMMAND_OUTPUT_TAIL_LINES = 200
+# Command output is read in fixed-size chunks: progress bars redraw with "\r"
+# and can run far past StreamReader's line limit without a newline.
+COMMAND_OUTPUT_CHUNK_SIZE = 65536
+# Runtimes are only forgotten when stopped, so new starts past this cap are refused.
+MAX_TRACKED_RUNTIMES = 1024
+HF_DOWNLOAD_ATTEMPTS = 5
+HF_DOWNLOAD_BACKOFF_S = 1.0
+# Network failures worth retrying; anything else (auth, missing repo) is final.
+TRANSIENT_DOWNLOAD_ERRORS: Tuple[type, ...] = (ConnectionError, TimeoutError, httpx.TransportError)
+if requests is not None:
+    TRANSIENT_DOWNLOAD_ERRORS += (requests.ConnectionError, requests.Timeout)
+if httpx2 is not None:
+    TRANSIENT_DOWNLOAD_ERRORS += (httpx2.TransportError,)
+
+_command_slots = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+T = TypeVar("T")
 
 
 class ModelRegistryService:
@@ -43,37 +97,84 @@ class ModelRegistryService:
 
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ollama_tags: Dict[str, Tuple[Optional[str], bytes, List[ModelInfo]]] = {}
+        self._catalog_cache = CatalogCache(settings.catalog_cache_ttl)
+        # The NGC catalog changes rarely, so it is kept for longer and on disk.
+        self._ngc_cache = CatalogCache(
+            settings.ngc_catalog_cache_ttl,
+            directory=(
+                pathlib.Path(settings.catalog_cache_dir).expanduser()
+                if settings.catalog_cache_dir
+                else None
+            ),
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        """Return the pooled client shared by every registry call."""
+        if self._http_client is None:
+            self._http_client = make_http_client(
+                timeout=REGISTRY_TIMEOUT_S,
+                max_connections=REGISTRY_MAX_CONNECTIONS,
+                max_keepalive=REGISTRY_MAX_CONNECTIONS,
+            )
+        return self._http_client
+
+    async def _run_blocking(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call on the registry's persistent worker threads."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=REGISTRY_EXECUTOR_WORKERS, thread_name_prefix="model-registry"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            http_client, self._http_client = self._http_client, None
+            await http_client.aclose()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False, cancel_futures=True)
 
     async def list_ollama_models(self, base_url: Optional[str] = None) -> List[ModelInfo]:
         base_url = (base_url or self.settings.ollama_base_url).rstrip("/")
-        url = f"{base_url}/api/tags"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-        payload = response.json()
-        models: List[ModelInfo] = []
-        for item in payload.get("models", []):
-            name = item.get("name") or item.get("model")
-            if not isinstance(name, str):
-                continue
-            models.append(
-                ModelInfo(
-                    name=name,
-                    size=_format_size(item.get("size")),
-                    digest=item.get("digest"),
-                    description=item.get("details"),
-                )
-            )
-        return models
+        return await self._catalog_cache.get_or_fetch(
+            "ollama", base_url, lambda: self._fetch_ollama_models(base_url)
+        )
+
+    async def _fetch_ollama_models(self, base_url: str) -> List[ModelInfo]:
+        # Tags rarely change, so the parsed models are kept per host and reused
+        # when the server answers 304 or returns byte-identical content.
+        previous = self._ollama_tags.get(base_url)
+        headers = {"If-None-Match": previous[0]} if previous and previous[0] else None
+        response = await self._client().get(f"{base_url}/api/tags", headers=headers)
+        if response.status_code == 304 and previous is not None:
+            return list(previous[2])
+        response.raise_for_status()
+
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if previous is not None and previous[1] == digest:
+            return list(previous[2])
+        payload = json_loads(response.content)
+        models = [
+            info for info in map(_ollama_model_info, payload.get("models", [])) if info is not None
+        ]
+        self._ollama_tags[base_url] = (response.headers.get("etag"), digest, models)
+        return list(models)
 
     async def pull_ollama_model(self, request: OllamaPullRequest) -> ModelActionResponse:
         base_url = (request.base_url or self.settings.ollama_base_url).rstrip("/")
         url = f"{base_url}/api/pull"
         payload = {"name": request.model_name, "stream": request.stream}
-        async with httpx.AsyncClient(timeout=600.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-        data = response.json()
+        response = await self._client().post(
+            url, json=payload, timeout=make_timeout(OLLAMA_PULL_TIMEOUT_S)
+        )
+        response.raise_for_status()
+        # The pull changes the host's installed models, which list_ollama_models caches.
+        self._catalog_cache.invalidate("ollama")
+        data = json_loads(response.content)
         status = data.get("status")
         detail = data.get("status") or data.get("detail") or "Pull completed"
         return ModelActionResponse(
@@ -87,63 +188,114 @@ class ModelRegistryService:
         if not api_key:
             raise HTTPException(status_code=400, detail="NGC API key is required to query NIM models")
 
-        url = f"https://api.ngc.nvidia.com/v2/models/org/{request.organization}"
-        params = {"pageSize": request.limit}
+        return await self._ngc_cache.get_or_fetch(
+            "nim",
+            CatalogCache.key_for(model_dump(request)),
+            lambda: self._fetch_nim_models(request, api_key),
+        )
+
+    async def _fetch_nim_models(self, request: NimSearchRequest, api_key: str) -> List[ModelInfo]:
+        url = _NGC_MODELS_URL(request.organization)
+        params: Dict[str, Any] = {"pageSize": request.limit}
         if request.query:
             params["query"] = request.query
+        headers = _bearer_headers(api_key)
 
-        headers = {"Authorization": f"Bearer {api_key}"}
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Organization not found on NGC")
-            response.raise_for_status()
-
-        data = response.json()
-        items = data.get("models") or data.get("resources") or []
-
-        models: List[ModelInfo] = []
-        for item in items:
-            name = item.get("name") or item.get("displayName")
-            if not isinstance(name, str):
-                continue
-            description = item.get("description")
-            if not isinstance(description, str):
-                description = None
-            version = None
-            if "latestVersion" in item and isinstance(item["latestVersion"], dict):
-                version = item["latestVersion"].get("version")
-            elif isinstance(item.get("version"), str):
-                version = item.get("version")
-            models.append(
-                ModelInfo(
-                    name=name,
-                    description=description,
-                    version=version,
+        try:
+            data = await request_with_retry(self._get_ngc_page, url, params, headers)
+            items = _ngc_items(data)
+            pagination = data.get("paginationInfo")
+            if len(items) < request.limit and isinstance(pagination, dict):
+                items.extend(
+                    await self._fetch_ngc_pages(url, params, headers, pagination, request.limit)
+                )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                raise HTTPException(
+                    status_code=404, detail="Organization not found on NGC"
+                ) from exc
+            raise
+
+        infos = [info for info in map(_nim_model_info, items) if info is not None]
+        return infos[: request.limit]
+
+    async def _fetch_ngc_pages(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        headers: httpx.Headers,
+        pagination: dict,
+        limit: int,
+    ) -> List[dict]:
+        """Fetch the pages after the first concurrently when NGC capped ``pageSize``."""
+        page_size = pagination.get("size")
+        total_pages = pagination.get("totalPages")
+        if not isinstance(page_size, int) or not isinstance(total_pages, int) or page_size < 1:
+            return []
+        pages = min(total_pages, -(-limit // page_size))
+        semaphore = asyncio.Semaphore(NGC_PAGE_CONCURRENCY)
+
+        async def fetch_page(page: int) -> List[dict]:
+            async with semaphore:
+                page_params = {**params, "pageSize": page_size, "page": page}
+                return _ngc_items(
+                    await request_with_retry(self._get_ngc_page, url, page_params, headers)
                 )
-            )
-        return models
 
-    async def pull_nim_model(self, request: NimPullRequest) -> ModelActionResponse:
-        api_key = request.api_key or self.settings.ngc_api_key
-        if not api_key:
-            raise HTTPException(status_code=400, detail="NGC API key is required to download NIM models")
+        results = await asyncio.gather(*map(fetch_page, range(1, pages)))
+        return [item for page_items in results for item in page_items]
 
-        if shutil.which("docker") is None:
-            raise HTTPException(status_code=500, detail="Docker CLI is required to pull NIM containers")
+    async def _get_ngc_page(self, url: str, params: Dict[str, Any], headers: httpx.Headers) -> dict:
+        response = await self._client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return json_loads(response.content)
 
-        repository = request.model_name
-        if request.tag:
-            repository = f"{repository}:{request.tag}"
+    async def pull_nim_model(self, request: NimPullRequest) -> ModelActionResponse:
+        api_key = self._nim_api_key(request)
+        _require_docker()
+
+        await _docker_login(api_key)
+        return await _docker_pull(request)
+
+    async def pull_nim_models(self, requests: List[NimPullRequest]) -> List[ModelActionResponse]:
+        """Pull several NIM containers concurrently after a single registry login.
+
+        Docker keeps one credential per registry, so every request must resolve to
+        the same NGC API key. A failed pull is reported in its own response rather
+        than aborting the rest of the batch.
+        """
+        if not requests:
+            return []
+        api_keys = {self._nim_api_key(request) for request in requests}
+        if len(api_keys) > 1:
+            raise HTTPException(
+                status_code=400, detail="Batch NIM pulls must share one NGC API key"
+            )
+        _require_docker()
 
-        login_cmd = ["docker", "login", "nvcr.io", "-u", "$oauthtoken", "--password-stdin"]
-        pull_cmd = ["docker", "pull", repository]
+        await _docker_login(api_keys.pop())
+        semaphore = asyncio.Semaphore(NIM_PULL_CONCURRENCY)
 
-        await _run_command(login_cmd, input_data=f"{api_key}\n")
-        pull_output = await _run_command(pull_cmd)
+        async def pull(request: NimPullRequest) -> ModelActionResponse:
+            async with semaphore:
+                try:
+                    return await _docker_pull(request)
+                except HTTPException as exc:
+                    return ModelActionResponse(
+                        status="failed",
+                        detail=str(exc.detail),
+                        metadata={"model_name": request.model_name},
+                    )
 
-        return ModelActionResponse(status="completed", detail="Docker pull succeeded", metadata={"output": pull_output})
+        return list(await asyncio.gather(*(pull(request) for request in requests)))
+
+    def _nim_api_key(self, request: NimPullRequest) -> str:
+        api_key = request.api_key or self.settings.ngc_api_key
+        if not api_key:
+            raise HTTPException(
+                status_code=400, detail="NGC API key is required to download NIM models"
+            )
+        return api_key
 
     async def search_huggingface_models(
         self, request: HuggingFaceSearchRequest
@@ -151,9 +303,16 @@ class ModelRegistryService:
         if HfApi is None:
             raise HTTPException(status_code=500, detail="huggingface-hub is not installed on the backend")
 
+        return await self._catalog_cache.get_or_fetch(
+            "huggingface",
+            CatalogCache.key_for(model_dump(request)),
+            lambda: self._fetch_huggingface_models(request),
+        )
+
+    async def _fetch_huggingface_models(self, request: HuggingFaceSearchRequest) -> List[ModelInfo]:
         api = HfApi(token=request.api_key or self.settings.hf_api_key)
         try:
-            models = await asyncio.to_thread(
+            models = await self._run_blocking(
                 lambda: list(api.list_models(search=request.query, limit=request.limit))
             )
         except Exception as exc:  # noqa: BLE001 - surface API errors to caller
@@ -185,18 +344,27 @@ class ModelRegistryService:
 
         target_dir = pathlib.Path(request.local_dir or self.settings.model_cache_dir)
         target_dir.mkdir(parents=True, exist_ok=True)
-
-        try:
-            path = await asyncio.to_thread(
-                snapshot_download,
-                repo_id=request.model_id,
-                revision=request.revision,
-                local_dir=str(target_dir),
-                token=token,
-                local_dir_use_symlinks=False,
-            )
-        except Exception as exc:  # noqa: BLE001 - propagate download failures
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if self.settings.hf_fast_transfer:
+            _enable_fast_hf_transfer()
+
+        # snapshot_download resumes partial files, so retrying a dropped
+        # connection only re-fetches what is missing.
+        for attempt in range(HF_DOWNLOAD_ATTEMPTS):
+            try:
+                path = await self._run_blocking(
+                    snapshot_download,
+                    repo_id=request.model_id,
+                    revision=request.revision,
+                    local_dir=str(target_dir),
+                    token=token,
+                    local_dir_use_symlinks=False,
+                    max_workers=self.settings.hf_download_workers,
+                )
+                break
+            except Exception as exc:  # noqa: BLE001 - propagate download failures
+                if not _is_transient_download_error(exc) or attempt == HF_DOWNLOAD_ATTEMPTS - 1:
+                    raise HTTPException(status_code=400, detail=str(exc)) from exc
+                await asyncio.sleep(min(HF_DOWNLOAD_BACKOFF_S * 2**attempt, MAX_RETRY_DELAY_S))
 
         return ModelActionResponse(
             status="completed",
@@ -207,7 +375,7 @@ class ModelRegistryService:
     async def setup_ngc_cli_model(self, request: NgcCliModelRequest) -> ModelActionResponse:
         """Download and prepare a model using the NGC CLI for local backends."""
 
-        ngc_path = shutil.which("ngc")
+        ngc_path = _which("ngc")
         if ngc_path is None:
             raise HTTPException(status_code=500, detail="NGC CLI must be installed on the backend host")
 
@@ -248,12 +416,12 @@ class ModelRegistryService:
         target_dir = pathlib.Path(self.settings.model_cache_dir) / model_name
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        cmd = shlex.split(request.pull_command)
+        cmd = list(_split_command(request.pull_command))
         if not cmd:
             raise HTTPException(status_code=400, detail="Pull command cannot be empty")
 
-        env = os.environ.copy()
-        env["NGC_CLI_API_KEY"] = request.api_key
+        # Built per call so environment changes after startup reach the CLI.
+        env = {**os.environ, "NGC_CLI_API_KEY": request.api_key}
 
         pull_output = await _run_command(cmd, env=env, cwd=str(target_dir))
 
@@ -266,17 +434,24 @@ class ModelRegistryService:
             nvfp4_available = True
             quantization_note = "Model quantized to NVFP4 for TensorRT-LLM pipeline"
 
-        backend_configs: Dict[str, dict] = {}
-        for backend in backends:
-            config = {
-                "model_dir": str(target_dir),
-                "model_name": request.model_name,
-                "trt_llm_pipeline": request.enable_trt_llm,
-                "nvfp4_available": nvfp4_available,
-            }
-            config_path = target_dir / f"{backend}_config.json"
-            config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
-            backend_configs[backend] = config
+        config = {
+            "model_dir": str(target_dir),
+            "model_name": request.model_name,
+            "trt_llm_pipeline": request.enable_trt_llm,
+            "nvfp4_available": nvfp4_available,
+        }
+        # Every backend gets the same config, so it is encoded once and the
+        # files are written concurrently off the event loop.
+        config_bytes = json_dumps_pretty(config)
+        await asyncio.gather(
+            *(
+                self._run_blocking(
+                    (target_dir / f"{backend}_config.json").write_bytes, config_bytes
+                )
+                for backend in backends
+            )
+        )
+        backend_configs: Dict[str, dict] = {backend: dict(config) for backend in backends}
 
         metadata = {
             "model_dir": str(target_dir),
@@ -303,17 +478,21 @@ class ModelRuntimeService:
         self.settings = settings
         self._lock = asyncio.Lock()
         self._running: Dict[BenchmarkProvider, Dict[str, ModelRuntimeInfo]] = defaultdict(dict)
+        # The same runtimes ordered by start time, oldest first, so listing them
+        # never needs a sort.
+        self._by_start: List[ModelRuntimeInfo] = []
+        self._base_urls: Dict[BenchmarkProvider, str] = {
+            BenchmarkProvider.OLLAMA: settings.ollama_base_url,
+            BenchmarkProvider.NIM: settings.nim_base_url,
+            BenchmarkProvider.VLLM: settings.vllm_base_url,
+            BenchmarkProvider.LLAMACPP: settings.llamacpp_base_url,
+        }
 
     def _default_base_url(self, provider: BenchmarkProvider) -> str:
-        if provider is BenchmarkProvider.OLLAMA:
-            return self.settings.ollama_base_url
-        if provider is BenchmarkProvider.NIM:
-            return self.settings.nim_base_url
-        if provider is BenchmarkProvider.VLLM:
-            return self.settings.vllm_base_url
-        if provider is BenchmarkProvider.LLAMACPP:
-            return self.settings.llamacpp_base_url
-        raise ValueError(f"Unsupported provider {provider}")
+        try:
+            return self._base_urls[provider]
+        except KeyError:
+            raise ValueError(f"Unsupported provider {provider}") from None
 
     async def start_model(self, request: ModelRuntimeRequest) -> ModelActionResponse:
         base_url = (request.base_url or self._default_base_url(request.provider)).rstrip("/")
@@ -321,11 +500,26 @@ class ModelRuntimeService:
             provider=request.provider,
             model_name=request.model_name,
             base_url=base_url,
-            started_at=datetime.utcnow().isoformat(),
+            # Fixed-width UTC timestamps sort chronologically as strings, which
+            # _by_start relies on; microseconds keep same-second starts apart.
+            started_at=format_timestamp(utcnow()),
         )
 
         async with self._lock:
+            previous = self._running[request.provider].get(request.model_name)
+            if previous is not None:
+                self._by_start.remove(previous)
+            elif len(self._by_start) >= MAX_TRACKED_RUNTIMES:
+                # Every tracked entry is still running, so none can be dropped.
+                raise HTTPException(
+                    status_code=409,
+                    detail=(
+                        f"Already tracking {MAX_TRACKED_RUNTIMES} running models; "
+                        "stop one before starting another"
+                    ),
+                )
             self._running[request.provider][request.model_name] = info
+            bisect.insort(self._by_start, info, key=_started_at)
 
         detail = f"Marked {request.model_name} as running for {request.provider.value}"
         return ModelActionResponse(status="running", detail=detail, metadata=model_dump(info))
@@ -337,63 +531,201 @@ class ModelRuntimeService:
             if existing is None:
                 detail = f"Model {request.model_name} was not registered as running"
                 return ModelActionResponse(status="missing", detail=detail, metadata=None)
+            self._by_start.remove(existing)
 
         detail = f"Stopped tracking {request.model_name} for {request.provider.value}"
         return ModelActionResponse(status="stopped", detail=detail, metadata=model_dump(existing))
 
     async def list_runtimes(self) -> ModelRuntimeListResponse:
         async with self._lock:
-            runtimes: List[ModelRuntimeInfo] = []
-            for provider_models in self._running.values():
-                runtimes.extend(provider_models.values())
-
-        runtimes.sort(key=lambda info: info.started_at, reverse=True)
+            runtimes = self._by_start[::-1]
         return ModelRuntimeListResponse(runtimes=runtimes)
 
 
+_started_at = attrgetter("started_at")
+_NGC_MODELS_URL = "https://api.ngc.nvidia.com/v2/models/org/{}".format
+
+
+@lru_cache(maxsize=8)
+def _bearer_headers(api_key: str) -> httpx.Headers:
+    # Shared between calls; httpx copies request headers rather than mutating them.
+    return httpx.Headers({"Authorization": f"Bearer {api_key}"})
+
+
+_executables: Dict[str, str] = {}
+_DOCKER_LOGIN_CMD = ("docker", "login", "nvcr.io", "-u", "$oauthtoken", "--password-stdin")
+
+
+@lru_cache(maxsize=256)
+def _split_command(command: str) -> Tuple[str, ...]:
+    """Tokenize a shell command once; repeated setups reuse the parsed tuple."""
+    return tuple(shlex.split(command))
+
+
 async def _run_command(
-    cmd: List[str],
+    cmd: Sequence[str],
     input_data: Optional[str] = None,
     *,
     env: Optional[dict] = None,
     cwd: Optional[str] = None,
 ) -> str:
-    """Execute a command asynchronously and capture its output."""
-
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdin=asyncio.subprocess.PIPE if input_data else None,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=env,
-        cwd=cwd,
-    )
-    stdout, stderr = await process.communicate(
-        input=input_data.encode() if input_data else None
-    )
+    """Execute a command asynchronously and return the tail of its output.
+
+    stdout and stderr are merged and split on ``\n`` and ``\r``, keeping only the
+    last ``COMMAND_OUTPUT_TAIL_LINES`` lines, so chatty commands such as
+    ``docker pull`` run in constant memory. The child is killed if reading its
+    output fails or the caller is cancelled.
+    """
+
+    async with _command_slots:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if input_data else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=env,
+            cwd=cwd,
+        )
+        tail: Deque[str] = deque(maxlen=COMMAND_OUTPUT_TAIL_LINES)
+        try:
+            if input_data:
+                process.stdin.write(input_data.encode())
+                await process.stdin.drain()
+                process.stdin.close()
+            pending = b""
+            while chunk := await process.stdout.read(COMMAND_OUTPUT_CHUNK_SIZE):
+                lines = (pending + chunk).splitlines(keepends=True)
+                pending = b"" if lines[-1].endswith((b"\n", b"\r")) else lines.pop()
+                # A line that never ends only keeps its most recent chunk.
+                pending = pending[-COMMAND_OUTPUT_CHUNK_SIZE:]
+                tail.extend(line.decode(errors="replace").rstrip() for line in lines)
+            if pending:
+                tail.append(pending.decode(errors="replace").rstrip())
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+    output = "\n".join(tail).strip()
     if process.returncode != 0:
         raise HTTPException(
             status_code=500,
-            detail=f"Command {' '.join(cmd)} failed: {stderr.decode() or stdout.decode()}",
+            detail=f"Command {' '.join(cmd)} failed: {output}",
         )
-    output = stdout.decode().strip()
-    if stderr:
-        output = f"{output}\n{stderr.decode().strip()}".strip()
     return output
 
 
+def _which(name: str) -> Optional[str]:
+    """Resolve a CLI on PATH, remembering hits to skip the directory scan next time.
+
+    Misses are not cached, so a tool installed while the backend runs is found.
+    """
+    path = _executables.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _executables[name] = path
+    return path
+
+
+def _require_docker() -> None:
+    if _which("docker") is None:
+        raise HTTPException(status_code=500, detail="Docker CLI is required to pull NIM containers")
+
+
+async def _docker_login(api_key: str) -> None:
+    await _run_command(_DOCKER_LOGIN_CMD, input_data=f"{api_key}\n")
+
+
+async def _docker_pull(request: NimPullRequest) -> ModelActionResponse:
+    repository = request.model_name
+    if request.tag:
+        repository = f"{repository}:{request.tag}"
+    pull_output = await _run_command(["docker", "pull", repository])
+    return ModelActionResponse(
+        status="completed", detail="Docker pull succeeded", metadata={"output": pull_output}
+    )
+
+
+def _ollama_model_info(item: dict) -> Optional[ModelInfo]:
+    name = item.get("name") or item.get("model")
+    if not isinstance(name, str):
+        return None
+    digest = item.get("digest")
+    description = item.get("details")
+    # Every field is type-checked here, so skip pydantic validation per entry.
+    return model_construct(
+        ModelInfo,
+        name=name,
+        size=_format_size(item.get("size")),
+        digest=digest if isinstance(digest, str) else None,
+        description=description if isinstance(description, str) else None,
+    )
+
+
+def _ngc_items(data: dict) -> List[dict]:
+    return list(data.get("models") or data.get("resources") or [])
+
+
+def _nim_model_info(item: dict) -> Optional[ModelInfo]:
+    name = item.get("name") or item.get("displayName")
+    if not isinstance(name, str):
+        return None
+    description = item.get("description")
+    latest = item.get("latestVersion")
+    version = latest.get("version") if isinstance(latest, dict) else item.get("version")
+    return model_construct(
+        ModelInfo,
+        name=name,
+        description=description if isinstance(description, str) else None,
+        version=version if isinstance(version, str) else None,
+    )
+
+
+@lru_cache(maxsize=1)
+def _enable_fast_hf_transfer() -> None:
+    """Switch huggingface_hub to whichever Rust transfer backend is installed.
+
+    Runs before the first download instead of at import, and leaves any flag the
+    operator exported (including "0") alone.
+    """
+    # huggingface_hub before 1.0 reads this constant on every download.
+    if (
+        hasattr(hf_constants, "HF_HUB_ENABLE_HF_TRANSFER")
+        and "HF_HUB_ENABLE_HF_TRANSFER" not in os.environ
+        and importlib.util.find_spec("hf_transfer") is not None
+    ):
+        hf_constants.HF_HUB_ENABLE_HF_TRANSFER = True
+    # hf_xet takes its tuning from the process environment when it starts a transfer.
+    if importlib.util.find_spec("hf_xet") is not None:
+        os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
+
+def _is_transient_download_error(exc: BaseException) -> bool:
+    # snapshot_download reports an unreachable Hub as LocalEntryNotFoundError
+    # chained from the underlying connection error.
+    return isinstance(exc, TRANSIENT_DOWNLOAD_ERRORS) or isinstance(
+        exc.__cause__, TRANSIENT_DOWNLOAD_ERRORS
+    )
+
+
+_SIZE_SUFFIXES = ("B", "KB", "MB", "GB", "TB")
+
+
 def _format_size(value: Optional[object]) -> Optional[str]:
     if value is None:
         return None
     if isinstance(value, (int, float)):
-        # Convert bytes to a human readable string
-        size = float(value)
-        suffixes = ["B", "KB", "MB", "GB", "TB"]
-        idx = 0
-        while size >= 1024 and idx < len(suffixes) - 1:
-            size /= 1024
-            idx += 1
-        return f"{size:.1f} {suffixes[idx]}"
+        return _format_bytes(value)
     if isinstance(value, str):
         return value
     return str(value)
+
+
+@lru_cache(maxsize=4096)
+def _format_bytes(size: float) -> str:
+    """Convert a byte count to a human readable string."""
+    # Each suffix step is 2**10, so the bit length of the integer part picks the
+    # suffix directly instead of dividing by 1024 in a loop.
+    idx = min((max(int(size), 1).bit_length() - 1) // 10, len(_SIZE_SUFFIXES) - 1)
+    return f"{size / (1 << (10 * idx)):.1f} {_SIZE_SUFFIXES[idx]}"
@@ -1,18 +1,48 @@
 """Database models."""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict
 
-from sqlalchemy import JSON, Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    literal,
+    select,
+    true,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.sqlite import JSON as SQLITE_JSON
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 
 from .database import Base
 from .schemas import BenchmarkProvider
 
+RUN_COUNT = "run_count"
+
+
+def utcnow() -> datetime:
+    """Current UTC time as the naive datetime the ``DateTime`` columns store."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Render a naive UTC timestamp in the one format every API response uses."""
+    return value.isoformat(timespec="microseconds")
+
 
 class BenchmarkRun(Base):
     __tablename__ = "benchmark_runs"
+    # Serves the newest-first history listing and its keyset cursor predicate.
+    __table_args__ = (Index("ix_benchmark_runs_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     provider = Column(Enum(BenchmarkProvider), nullable=False)
@@ -22,25 +52,10 @@ class BenchmarkRun(Base):
     parameters = Column(JSON().with_variant(SQLITE_JSON, "sqlite"), nullable=False)
     metrics = Column(JSON().with_variant(SQLITE_JSON, "sqlite"), nullable=True)
     error = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "provider": self.provider.value,
-            "model_name": self.model_name,
-            "status": self.status,
-            "prompt": self.prompt,
-            "parameters": self.parameters,
-            "metrics": self.metrics,
-            "error": self.error,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-        }
-
     @classmethod
     def from_request(
         cls,
@@ -58,18 +73,38 @@ class BenchmarkRun(Base):
             status=status,
         )
 
-    def mark_started(self) -> None:
-        self.status = "running"
-        self.started_at = datetime.utcnow()
-
-    def mark_completed(self, metrics: Dict[str, Any]) -> None:
-        self.status = "completed"
-        self.metrics = metrics
-        self.completed_at = datetime.utcnow()
-
-    def mark_failed(self, error: str, metrics: Optional[Dict[str, Any]] = None) -> None:
-        self.status = "failed"
-        self.error = error
-        if metrics:
-            self.metrics = metrics
-        self.completed_at = datetime.utcnow()
+
+class Counter(Base):
+    """Named running total kept in step with inserts so reading it is O(1)."""
+
+    __tablename__ = "counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+def seed_counters(bind: Engine) -> None:
+    """Create the run counter from a full count unless it already exists.
+
+    Runs once from ``create_all`` at startup, before any request can insert a
+    run, so the count and the per-insert increments never race. The seed is a
+    single ``INSERT ... SELECT`` that ignores an existing row, so workers
+    starting together cannot trip over each other's seed.
+    """
+    total = select(literal(RUN_COUNT), func.count(BenchmarkRun.id)).where(true())
+    with bind.begin() as connection:
+        dialect = connection.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = (
+                insert(Counter)
+                .from_select(["name", "value"], total)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            connection.execute(statement)
+            return
+    try:
+        with bind.begin() as connection:
+            connection.execute(Counter.__table__.insert().from_select(["name", "value"], total))
+    except IntegrityError:
+        pass  # another worker seeded it first
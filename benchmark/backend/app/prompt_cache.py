@@ -0,0 +1,122 @@
+"""Persistent cache for model-generated benchmark prompts."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .serialization import dumps as json_dumps, dumps_sorted, loads as json_loads
+from .settings import Settings
+
+logger = logging.getLogger(__name__)
+
+TMPFS_CACHE_DIR = "/dev/shm/nim_dashboard"
+
+
+class PromptCache:
+    """Stores generated prompt sets in a JSON file keyed by a hash of their inputs.
+
+    Re-using the same prompt set keeps repeated runs comparable and avoids asking
+    the model for new prompts before every benchmark. Entries older than
+    ``ttl_s`` are regenerated. A cache without a path is disabled and always
+    calls the generator.
+    """
+
+    def __init__(self, path: Optional[Path], ttl_s: Optional[float] = None) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self._entries: Optional[Dict[str, Any]] = None
+        # Generations in progress, so concurrent runs with the same key share one.
+        self._inflight: Dict[str, asyncio.Task[List[str]]] = {}
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "PromptCache":
+        mode = settings.prompt_cache_mode.lower()
+        ttl_s = settings.prompt_cache_ttl or None
+        if mode == "none":
+            return cls(None)
+        if mode == "tmpfs":
+            return cls(Path(TMPFS_CACHE_DIR) / "prompts.json", ttl_s)
+        if mode == "file":
+            return cls(Path(settings.prompt_cache_dir).expanduser() / "prompts.json", ttl_s)
+        raise ValueError(f"Unsupported prompt cache mode {settings.prompt_cache_mode!r}")
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        return hashlib.blake2b(dumps_sorted(parts), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        if self.path is None:
+            return None
+        entry = self._load().get(key)
+        # Entries written before expiry was tracked are plain lists; treat them as stale.
+        if not isinstance(entry, dict):
+            return None
+        created_at = entry.get("created_at")
+        if self.ttl_s is not None and (
+            not isinstance(created_at, (int, float)) or time.time() - created_at > self.ttl_s
+        ):
+            return None
+        prompts = entry.get("prompts")
+        return prompts if isinstance(prompts, list) else None
+
+    async def set(self, key: str, prompts: List[str]) -> None:
+        if self.path is None:
+            return
+        entries = self._load()
+        entries[key] = {"created_at": time.time(), "prompts": prompts}
+        # Serialize on the loop so the worker thread never sees the dict change.
+        payload = json_dumps(entries)
+        async with self._write_lock:
+            await asyncio.to_thread(self._write, payload)
+
+    async def load_or_generate(
+        self, key: str, generate: Callable[[], Awaitable[List[str]]]
+    ) -> List[str]:
+        if self.path is None:
+            return await generate()
+        cached = self.get(key)
+        if cached:
+            return list(cached)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_and_store(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller does not abort the generation for the rest.
+        return list(await asyncio.shield(task))
+
+    async def _generate_and_store(
+        self, key: str, generate: Callable[[], Awaitable[List[str]]]
+    ) -> List[str]:
+        prompts = await generate()
+        await self.set(key, prompts)
+        return prompts
+
+    def _write(self, payload: bytes) -> None:
+        """Atomically replace the cache file; runs in a worker thread."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Could not persist prompt cache to %s: %s", self.path, exc)
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    data = json_loads(self.path.read_bytes())
+                except (OSError, ValueError) as exc:
+                    logger.warning("Ignoring unreadable prompt cache %s: %s", self.path, exc)
+                else:
+                    if isinstance(data, dict):
+                        self._entries = data
+        return self._entries
@@ -4,7 +4,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import AnyHttpUrl, BaseModel, Field, PositiveInt, conint
+from pydantic import AnyHttpUrl, BaseModel, Field
 
 
 class BenchmarkProvider(str, Enum):
@@ -23,15 +23,38 @@ class BackendMetadata(BaseModel):
 
 
 class BenchmarkParameters(BaseModel):
-    request_count: PositiveInt = Field(default=20)
-    concurrency: conint(ge=1, le=256) = Field(default=4)
-    warmup_requests: conint(ge=0, le=100) = Field(default=2)
-    max_tokens: PositiveInt = Field(default=512)
+    request_count: int = Field(default=20, gt=0)
+    concurrency: int = Field(default=4, ge=1, le=256)
+    warmup_requests: int = Field(default=2, ge=0, le=100)
+    max_tokens: int = Field(default=512, gt=0)
     temperature: float = Field(default=0.2, ge=0.0, le=2.0)
     top_p: float = Field(default=0.9, ge=0.0, le=1.0)
     repetition_penalty: float = Field(default=1.0, ge=0.0)
     stream: bool = Field(default=True)
     timeout: float = Field(default=120.0, gt=0)
+    pool_connections: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=1024,
+        description="Maximum HTTP connections in the client pool. Defaults to the concurrency.",
+    )
+    pool_keepalive: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=1024,
+        description="Maximum idle keep-alive connections retained. Defaults to the concurrency.",
+    )
+    use_http2: bool = Field(
+        default=True,
+        description=(
+            "Negotiate HTTP/2 so concurrent requests share multiplexed connections. Servers that "
+            "only speak HTTP/1.1, such as llama.cpp, are used over HTTP/1.1 automatically."
+        ),
+    )
+    keep_raw_responses: bool = Field(
+        default=False,
+        description="Retain each decoded backend response on its request metrics (debugging only).",
+    )
 
 
 class BackendSpecificParameters(BaseModel):
@@ -53,8 +76,10 @@ class BenchmarkRequest(BaseModel):
         default=False,
         description="When enabled the backend will ask the model to generate random prompts before benchmarking.",
     )
-    random_prompt_count: conint(ge=1, le=100) = Field(
+    random_prompt_count: int = Field(
         default=5,
+        ge=1,
+        le=100,
         description="Number of random prompts to request from the model when generation is enabled.",
     )
     parameters: BenchmarkParameters = Field(default_factory=BenchmarkParameters)
@@ -70,6 +95,16 @@ class AutoBenchmarkRequest(BaseModel):
     sweep_concurrency: List[int] = Field(default_factory=lambda: [1, 2, 4])
     sweep_max_tokens: List[int] = Field(default_factory=lambda: [256, 512])
     sweep_temperature: List[float] = Field(default_factory=lambda: [0.1, 0.5])
+    sweep_parallelism: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        description=(
+            "Number of sweep combinations executed concurrently. Values above 1 shorten "
+            "grid exploration but combinations then compete for the backend, so their "
+            "latency figures are no longer isolated."
+        ),
+    )
     parameters: BenchmarkParameters = Field(default_factory=BenchmarkParameters)
     backend_parameters: BackendSpecificParameters = Field(default_factory=BackendSpecificParameters)
     metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -99,9 +134,20 @@ class BenchmarkHistoryItem(BaseModel):
     error: Optional[str]
 
 
+class AutoBenchmarkItem(BenchmarkHistoryItem):
+    """One streamed auto-benchmark row, tagged with the combination it measured."""
+
+    combination: int = Field(description="Position of the combination in the sweep grid.")
+    parameters: Dict[str, Any]
+
+
 class PaginatedBenchmarkHistory(BaseModel):
     runs: List[BenchmarkHistoryItem]
     total: int
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the following page; absent on the last page.",
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -149,7 +195,7 @@ class ModelRuntimeListResponse(BaseModel):
 class NimSearchRequest(BaseModel):
     api_key: Optional[str] = None
     query: Optional[str] = Field(default=None, description="Filter models by a search term.")
-    limit: conint(ge=1, le=200) = Field(default=25)
+    limit: int = Field(default=25, ge=1, le=200)
     organization: str = Field(default="nvidia", description="NGC organization to inspect.")
 
 
@@ -162,7 +208,7 @@ class NimPullRequest(BaseModel):
 class HuggingFaceSearchRequest(BaseModel):
     api_key: Optional[str] = None
     query: Optional[str] = Field(default=None, description="Free-text search expression")
-    limit: conint(ge=1, le=100) = Field(default=20)
+    limit: int = Field(default=20, ge=1, le=100)
 
 
 class HuggingFaceDownloadRequest(BaseModel):
@@ -0,0 +1,48 @@
+"""JSON helpers that prefer orjson when it is installed.
+
+``dumps`` always returns UTF-8 encoded bytes, ready to send as a request body.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # Optional dependency: orjson parses (and accepts bytes) several times faster
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore
+
+
+if orjson is not None:
+    loads = orjson.loads
+    dumps = orjson.dumps
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Encode ``obj`` with two-space indentation for human-edited files."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def dumps_sorted(obj: Any) -> bytes:
+        """Encode ``obj`` with sorted keys, falling back to ``str``, for hashing into cache keys."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
+
+else:  # pragma: no cover - stdlib fallback
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Encode ``obj`` with two-space indentation for human-edited files."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def dumps_sorted(obj: Any) -> bytes:
+        """Encode ``obj`` with sorted keys, falling back to ``str``, for hashing into cache keys."""
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, sort_keys=True, default=str
+        ).encode("utf-8")
+
+
+# Both orjson.JSONDecodeError and json.JSONDecodeError subclass ValueError.
+JSONDecodeError = ValueError
+
+__all__ = ["JSONDecodeError", "dumps", "dumps_pretty", "dumps_sorted", "loads"]
@@ -2,122 +2,292 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, List, Optional
+import base64
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, and_, func, or_, select, update
 
-from .benchmark import BenchmarkExecutor, run_auto_benchmark
+from .benchmark import BenchmarkExecutor, SweepResult, build_sweep_requests, run_auto_benchmark
 from .database import get_session
-from .models import BenchmarkRun
-from .schemas import AutoBenchmarkRequest, BenchmarkHistoryItem, BenchmarkRequest, BenchmarkResult
-from .utils import model_dump
+from .models import RUN_COUNT, BenchmarkRun, Counter, format_timestamp, utcnow
+from .schemas import (
+    AutoBenchmarkRequest,
+    BenchmarkHistoryItem,
+    BenchmarkRequest,
+    PaginatedBenchmarkHistory,
+)
+from .serialization import dumps as json_dumps, loads as json_loads
+from .utils import model_construct, model_dump
+
+# History pages are served from memory for this long unless a run changes first.
+HISTORY_CACHE_TTL_S = 2.0
+HISTORY_CACHE_MAX_PAGES = 64
+
+# Finished runs never change again, so their history items can be cached.
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+FINISHED_RUN_CACHE_SIZE = 1024
+
+
+def encode_cursor(item: BenchmarkHistoryItem) -> str:
+    """Encode the position after ``item`` as an opaque keyset pagination cursor."""
+    payload = json_dumps({"created_at": item.created_at, "id": item.id})
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the ``(created_at, id)`` position encoded by :func:`encode_cursor`."""
+    try:
+        payload = json_loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid pagination cursor {cursor!r}") from exc
 
 
 class BenchmarkService:
     def __init__(self) -> None:
-        self._tasks: Dict[int, asyncio.Task[BenchmarkResult]] = {}
-        self._lock = asyncio.Lock()
+        # Strong references keep scheduled runs alive; the event loop only holds
+        # weak ones. Each task drops itself on completion.
+        self._tasks: Set[asyncio.Task[None]] = set()
+        # Bumped whenever a run is created or changes status; cached pages built
+        # under an older version are never served.
+        self._history_version = 0
+        self._history_cache: Dict[
+            Tuple[int, int, Optional[str]], Tuple[float, int, PaginatedBenchmarkHistory]
+        ] = {}
+        self._finished_runs: OrderedDict[int, BenchmarkHistoryItem] = OrderedDict()
+
+    def _invalidate_history(self) -> None:
+        self._history_version += 1
+        self._history_cache.clear()
 
     async def create_run(self, request: BenchmarkRequest) -> BenchmarkRun:
-        async with self._lock:
-            with get_session() as session:
-                run = BenchmarkRun.from_request(
-                    provider=request.provider,
-                    model_name=request.model_name,
-                    prompt=request.prompt,
-                    parameters={
-                        "base_url": str(request.base_url) if request.base_url else None,
-                        "parameters": model_dump(request.parameters),
-                        "backend_parameters": model_dump(request.backend_parameters),
-                        "prompt_settings": {
-                            "use_random_prompts": request.use_random_prompts,
-                            "random_prompt_count": request.random_prompt_count,
-                        },
-                        "metadata": request.metadata,
-                    },
-                )
-                session.add(run)
-                session.flush()
-                session.refresh(run)
-                return run
+        run = BenchmarkRun.from_request(
+            provider=request.provider,
+            model_name=request.model_name,
+            prompt=request.prompt,
+            parameters={
+                "base_url": str(request.base_url) if request.base_url else None,
+                "parameters": model_dump(request.parameters),
+                "backend_parameters": model_dump(request.backend_parameters),
+                "prompt_settings": {
+                    "use_random_prompts": request.use_random_prompts,
+                    "random_prompt_count": request.random_prompt_count,
+                },
+                "metadata": request.metadata,
+            },
+        )
+        # The database serialises concurrent inserts and counter bumps itself.
+        await asyncio.to_thread(_insert_run, run)
+        self._invalidate_history()
+        return run
 
     async def run_benchmark(self, run_id: int, request: BenchmarkRequest) -> None:
-        executor = BenchmarkExecutor(request)
         try:
-            with get_session() as session:
-                run = session.get(BenchmarkRun, run_id)
-                if not run:
-                    return
-                run.mark_started()
-                session.add(run)
+            executor = BenchmarkExecutor(request)
+            if not await asyncio.to_thread(
+                _update_run, run_id, status="running", started_at=utcnow()
+            ):
+                return
+            self._invalidate_history()
 
             result = await executor.run(run_id=run_id)
 
-            with get_session() as session:
-                run = session.get(BenchmarkRun, run_id)
-                if not run:
-                    return
-                run.mark_completed(result.metrics)
-                session.add(run)
+            if not await asyncio.to_thread(
+                _update_run,
+                run_id,
+                status="completed",
+                metrics=result.metrics,
+                completed_at=utcnow(),
+            ):
+                return
+            self._invalidate_history()
         except Exception as exc:  # noqa: BLE001
-            with get_session() as session:
-                run = session.get(BenchmarkRun, run_id)
-                if run:
-                    run.mark_failed(str(exc))
-                    session.add(run)
+            await asyncio.to_thread(
+                _update_run, run_id, status="failed", error=str(exc), completed_at=utcnow()
+            )
+            self._invalidate_history()
             raise
 
     async def schedule_run(self, request: BenchmarkRequest) -> BenchmarkRun:
         run = await self.create_run(request)
         task = asyncio.create_task(self.run_benchmark(run.id, request))
-        async with self._lock:
-            self._tasks[run.id] = task
-        task.add_done_callback(lambda t, run_id=run.id: self._tasks.pop(run_id, None))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
         return run
 
-    async def run_auto(self, request: AutoBenchmarkRequest) -> List[BenchmarkResult]:
-        return await run_auto_benchmark(request)
+    def prepare_auto(self, request: AutoBenchmarkRequest) -> List[BenchmarkRequest]:
+        """Validate the whole sweep grid; raises ``ValueError`` on a bad combination."""
+        return build_sweep_requests(request)
+
+    async def run_auto(
+        self, request: AutoBenchmarkRequest, sweep: Optional[List[BenchmarkRequest]] = None
+    ) -> AsyncIterator[SweepResult]:
+        """Yield each sweep result as soon as its combination completes."""
+        async for result in run_auto_benchmark(request, sweep):
+            yield result
 
     async def get_run(self, run_id: int) -> Optional[BenchmarkHistoryItem]:
-        with get_session() as session:
-            run = session.get(BenchmarkRun, run_id)
-            if not run:
-                return None
-            data = run.to_dict()
-            return BenchmarkHistoryItem(
-                id=data["id"],
-                provider=run.provider,
-                model_name=data["model_name"],
-                status=data["status"],
-                created_at=data["created_at"],
-                completed_at=data["completed_at"],
-                metrics=data["metrics"],
-                error=data["error"],
-            )
+        cached = self._finished_runs.get(run_id)
+        if cached is not None:
+            self._finished_runs.move_to_end(run_id)
+            return cached
 
-    async def list_runs(self, limit: int = 20, offset: int = 0) -> List[BenchmarkHistoryItem]:
-        with get_session() as session:
-            statement = (
-                select(BenchmarkRun)
-                .order_by(BenchmarkRun.created_at.desc())
-                .offset(offset)
-                .limit(limit)
-            )
-            runs = session.execute(statement).scalars().all()
-            return [
-                BenchmarkHistoryItem(
-                    id=run.id,
-                    provider=run.provider,
-                    model_name=run.model_name,
-                    status=run.status,
-                    created_at=run.created_at.isoformat(),
-                    completed_at=run.completed_at.isoformat() if run.completed_at else None,
-                    metrics=run.metrics,
-                    error=run.error,
-                )
-                for run in runs
-            ]
+        # Project only the history columns; prompt and parameters can be large.
+        statement = select(*_HISTORY_COLUMNS).where(BenchmarkRun.id == run_id)
+        rows = await asyncio.to_thread(_fetch_rows, statement)
+        if not rows:
+            return None
+        item = _history_item(rows[0])
+        if item.status in TERMINAL_STATUSES:
+            self._finished_runs[run_id] = item
+            if len(self._finished_runs) > FINISHED_RUN_CACHE_SIZE:
+                self._finished_runs.popitem(last=False)
+        return item
+
+    async def list_history(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> PaginatedBenchmarkHistory:
+        """Return one history page, reusing a recent identical page when nothing changed.
+
+        With a ``cursor`` the page starts right after the encoded run and ``offset``
+        is ignored; otherwise legacy offset pagination is used.
+        """
+        key = (limit, offset, cursor)
+        version = self._history_version
+        cached = self._history_cache.get(key)
+        if cached is not None:
+            cached_at, cached_version, page = cached
+            if cached_version == version and time.monotonic() - cached_at < HISTORY_CACHE_TTL_S:
+                return page
+
+        runs, total = await self.list_runs_with_total(limit=limit, offset=offset, cursor=cursor)
+        next_cursor = encode_cursor(runs[-1]) if runs and len(runs) == limit else None
+        page = PaginatedBenchmarkHistory(runs=runs, total=total, next_cursor=next_cursor)
+        if version == self._history_version:
+            if len(self._history_cache) >= HISTORY_CACHE_MAX_PAGES:
+                self._history_cache.clear()
+            self._history_cache[key] = (time.monotonic(), version, page)
+        return page
+
+    async def list_runs(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> List[BenchmarkHistoryItem]:
+        rows = await asyncio.to_thread(_fetch_rows, _runs_page_statement(limit, offset, cursor))
+        return [_history_item(row) for row in rows]
+
+    async def list_runs_with_total(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[BenchmarkHistoryItem], int]:
+        """Return one page of runs and the total run count from a single query.
+
+        The total rides along on every row as a scalar subquery of the run
+        counter, so a page costs one round trip instead of two.
+        """
+        total_column = (
+            select(Counter.value).where(Counter.name == RUN_COUNT).scalar_subquery().label("total")
+        )
+        statement = _runs_page_statement(limit, offset, cursor).add_columns(total_column)
+        rows = await asyncio.to_thread(_fetch_rows, statement)
+        runs = [_history_item(row) for row in rows]
+        total = rows[0].total if rows else None
+        if total is None:
+            # Empty page, or the counter has not been seeded yet.
+            total = await self.count_runs()
+        return runs, total
 
     async def count_runs(self) -> int:
-        with get_session() as session:
+        return await asyncio.to_thread(_count_runs)
+
+
+# History pages only need these columns; the prompt and parameters blobs stay in
+# the database.
+_HISTORY_COLUMNS = (
+    BenchmarkRun.id,
+    BenchmarkRun.provider,
+    BenchmarkRun.model_name,
+    BenchmarkRun.status,
+    BenchmarkRun.created_at,
+    BenchmarkRun.completed_at,
+    BenchmarkRun.metrics,
+    BenchmarkRun.error,
+)
+
+
+# The synchronous session blocks below run in worker threads via
+# asyncio.to_thread so database I/O never stalls the event loop.
+
+
+def _insert_run(run: BenchmarkRun) -> None:
+    with get_session() as session:
+        session.add(run)
+        # Keep the run total in step within the same transaction. The row is
+        # seeded by create_all; without it this updates nothing and count_runs
+        # falls back to counting the table.
+        session.execute(
+            update(Counter).where(Counter.name == RUN_COUNT).values(value=Counter.value + 1)
+        )
+        # No refresh: the flush on commit fills in the primary key and the
+        # Python-side created_at default, which is all callers read back.
+
+
+def _fetch_rows(statement: Select) -> List[Row]:
+    with get_session() as session:
+        return session.execute(statement).all()
+
+
+def _count_runs() -> int:
+    with get_session() as session:
+        counter = session.get(Counter, RUN_COUNT)
+        if counter is None:
+            # Not seeded (create_all has not run against this database).
             return session.execute(select(func.count(BenchmarkRun.id))).scalar_one()
+        return counter.value
+
+
+def _update_run(run_id: int, **values: Any) -> bool:
+    """Write a run's status transition as one UPDATE, skipping the SELECT a load would cost.
+
+    Returns False when the run no longer exists.
+    """
+    with get_session() as session:
+        result = session.execute(
+            update(BenchmarkRun).where(BenchmarkRun.id == run_id).values(**values)
+        )
+    return result.rowcount > 0
+
+
+def _runs_page_statement(limit: int, offset: int, cursor: Optional[str]) -> Select:
+    statement = (
+        select(*_HISTORY_COLUMNS)
+        .order_by(BenchmarkRun.created_at.desc(), BenchmarkRun.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        # Keyset pagination: an index range scan whose cost does not grow
+        # with page depth, unlike OFFSET.
+        created_at, run_id = decode_cursor(cursor)
+        return statement.where(
+            or_(
+                BenchmarkRun.created_at < created_at,
+                and_(BenchmarkRun.created_at == created_at, BenchmarkRun.id < run_id),
+            )
+        )
+    return statement.offset(offset)
+
+
+def _history_item(run: Row) -> BenchmarkHistoryItem:
+    # Columns come back already typed, so skip per-row validation.
+    return model_construct(
+        BenchmarkHistoryItem,
+        id=run.id,
+        provider=run.provider,
+        model_name=run.model_name,
+        status=run.status,
+        created_at=format_timestamp(run.created_at),
+        completed_at=format_timestamp(run.completed_at) if run.completed_at else None,
+        metrics=run.metrics,
+        error=run.error,
+    )
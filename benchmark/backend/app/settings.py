@@ -8,8 +8,9 @@ from pathlib import Path
 from typing import List, Optional
 
 
+@lru_cache(maxsize=1)
 def _running_in_container() -> bool:
-    """Best-effort detection of containerised execution."""
+    """Best-effort detection of containerised execution, probed once per process."""
     if os.path.exists("/.dockerenv"):
         return True
     try:
@@ -53,6 +54,10 @@ def _default_llamacpp_base_url() -> str:
 def _split_origins(value: str | None) -> List[str]:
     if not value:
         return ["*"]
+    if "," not in value:
+        # Common case: "*" or a single origin.
+        origin = value.strip()
+        return [origin] if origin else []
     return [origin.strip() for origin in value.split(",") if origin.strip()]
 
 
@@ -63,8 +68,9 @@ def _default_frontend_base_url() -> str:
     return "http://localhost:5173"
 
 
+@lru_cache(maxsize=1)
 def _default_frontend_dist_path() -> str | None:
-    """Return the built frontend path when it exists locally."""
+    """Return the built frontend path when it exists locally, checked once per process."""
 
     candidate = Path(__file__).resolve().parents[2] / "frontend" / "dist"
     if candidate.exists():
@@ -72,6 +78,11 @@ def _default_frontend_dist_path() -> str | None:
     return None
 
 
+def _default_hf_download_workers() -> int:
+    """Parallel file downloads per Hugging Face snapshot, capped at 16."""
+    return min(16, os.cpu_count() or 1)
+
+
 @dataclass(slots=True)
 class Settings:
     api_title: str = field(default="NIM Benchmark API")
@@ -81,6 +92,10 @@ class Settings:
     frontend_dist_path: Optional[str] = field(default_factory=_default_frontend_dist_path)
 
     database_url: str = field(default="sqlite:///./data/benchmarks.db")
+    db_pool_size: int = field(default=20)
+    db_max_overflow: int = field(default=10)
+    db_pool_timeout: float = field(default=30.0)
+    db_pool_recycle: int = field(default=1800)
 
     default_timeout: float = field(default=120.0)
     request_concurrency: int = field(default=4)
@@ -96,6 +111,14 @@ class Settings:
     llamacpp_api_key: Optional[str] = field(default=None)
     hf_api_key: Optional[str] = field(default=None)
     model_cache_dir: str = field(default="./data/models")
+    prompt_cache_mode: str = field(default="none")
+    prompt_cache_dir: str = field(default="~/.cache/nim_dashboard")
+    prompt_cache_ttl: float = field(default=86400.0)
+    catalog_cache_ttl: float = field(default=120.0)
+    ngc_catalog_cache_ttl: float = field(default=86400.0)
+    catalog_cache_dir: Optional[str] = field(default="~/.cache/nim_dashboard/catalog")
+    hf_download_workers: int = field(default_factory=_default_hf_download_workers)
+    hf_fast_transfer: bool = field(default=True)
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -106,6 +129,10 @@ class Settings:
             frontend_base_url=os.getenv("FRONTEND_BASE_URL", _default_frontend_base_url()),
             frontend_dist_path=os.getenv("FRONTEND_DIST_PATH", _default_frontend_dist_path()),
             database_url=os.getenv("DATABASE_URL", "sqlite:///./data/benchmarks.db"),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+            db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            db_pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
             default_timeout=float(os.getenv("DEFAULT_TIMEOUT", "120")),
             request_concurrency=int(os.getenv("REQUEST_CONCURRENCY", "4")),
             request_count=int(os.getenv("REQUEST_COUNT", "20")),
@@ -122,6 +149,17 @@ class Settings:
             llamacpp_api_key=os.getenv("LLAMACPP_API_KEY"),
             hf_api_key=os.getenv("HF_API_KEY"),
             model_cache_dir=os.getenv("MODEL_CACHE_DIR", "./data/models"),
+            prompt_cache_mode=os.getenv("PROMPT_CACHE", "none"),
+            prompt_cache_dir=os.getenv("PROMPT_CACHE_DIR", "~/.cache/nim_dashboard"),
+            prompt_cache_ttl=float(os.getenv("PROMPT_CACHE_TTL", "86400")),
+            catalog_cache_ttl=float(os.getenv("CATALOG_CACHE_TTL", "120")),
+            ngc_catalog_cache_ttl=float(os.getenv("NGC_CATALOG_CACHE_TTL", "86400")),
+            catalog_cache_dir=os.getenv("CATALOG_CACHE_DIR", "~/.cache/nim_dashboard/catalog")
+            or None,
+            hf_download_workers=int(
+                os.getenv("HF_DOWNLOAD_WORKERS", str(_default_hf_download_workers()))
+            ),
+            hf_fast_transfer=os.getenv("HF_FAST_TRANSFER", "1") != "0",
         )
 
 
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import math
+from array import array
 from dataclasses import dataclass, field
-from statistics import mean
 from typing import Dict, List
 
 from .clients.base import RequestMetrics
@@ -11,16 +11,34 @@ from .clients.base import RequestMetrics
 
 @dataclass
 class StatsAccumulator:
-    latencies: List[float] = field(default_factory=list)
-    ttfts: List[float] = field(default_factory=list)
-    tokens: List[int] = field(default_factory=list)
-    inter_token_latencies: List[float] = field(default_factory=list)
+    """Aggregates request metrics as they arrive.
+
+    Averages and totals are kept as running sums so memory stays constant; only
+    latencies are retained individually because percentiles are reported exactly.
+    They are stored as unboxed doubles, 8 bytes per sample instead of a float object.
+    """
+
+    latencies: array = field(default_factory=lambda: array("d"))
+    latency_total_ms: float = 0.0
+    ttft_total_ms: float = 0.0
+    tokens_total: int = 0
+    inter_token_latency_total_ms: float = 0.0
+    inter_token_samples: int = 0
+    server_latency_total_ms: float = 0.0
+    server_latency_samples: int = 0
 
     def add(self, metrics: RequestMetrics) -> None:
         self.latencies.append(metrics.latency_ms)
-        self.ttfts.append(metrics.ttft_ms)
-        self.tokens.append(metrics.tokens_generated)
-        self.inter_token_latencies.append(metrics.avg_inter_token_latency_ms)
+        self.latency_total_ms += metrics.latency_ms
+        self.ttft_total_ms += metrics.ttft_ms
+        self.tokens_total += metrics.tokens_generated
+        # Skip zero entries to avoid skew when a backend cannot report streaming metrics
+        if metrics.avg_inter_token_latency_ms > 0:
+            self.inter_token_latency_total_ms += metrics.avg_inter_token_latency_ms
+            self.inter_token_samples += 1
+        if metrics.server_latency_ms is not None:
+            self.server_latency_total_ms += metrics.server_latency_ms
+            self.server_latency_samples += 1
 
     def summarize(self) -> Dict[str, float]:
         if not self.latencies:
@@ -34,29 +52,33 @@ class StatsAccumulator:
                 "tokens_total": 0,
             }
 
+        requests_total = len(self.latencies)
         sorted_latencies = sorted(self.latencies)
         p50 = percentile(sorted_latencies, 50)
         p95 = percentile(sorted_latencies, 95)
-        total_tokens = sum(self.tokens)
-        total_time_s = sum(self.latencies) / 1000.0
-        tps = total_tokens / total_time_s if total_time_s > 0 else 0.0
-        # Filter out zero entries to avoid skew when a backend cannot report streaming metrics
-        non_zero_inter_latencies = [value for value in self.inter_token_latencies if value > 0]
+        total_time_s = self.latency_total_ms / 1000.0
+        tps = self.tokens_total / total_time_s if total_time_s > 0 else 0.0
         avg_inter_latency = (
-            mean(non_zero_inter_latencies)
-            if non_zero_inter_latencies
+            self.inter_token_latency_total_ms / self.inter_token_samples
+            if self.inter_token_samples
             else 0.0
         )
 
-        return {
-            "requests_total": len(self.latencies),
+        summary = {
+            "requests_total": requests_total,
             "latency_p50_ms": p50,
             "latency_p95_ms": p95,
-            "ttft_avg_ms": mean(self.ttfts),
+            "ttft_avg_ms": self.ttft_total_ms / requests_total,
             "inter_token_latency_avg_ms": avg_inter_latency,
             "tokens_per_second": tps,
-            "tokens_total": total_tokens,
+            "tokens_total": self.tokens_total,
         }
+        # Only backends that report their own timings (llama.cpp) contribute this.
+        if self.server_latency_samples:
+            summary["server_latency_avg_ms"] = (
+                self.server_latency_total_ms / self.server_latency_samples
+            )
+        return summary
 
 
 def percentile(sorted_values: List[float], percentile_value: float) -> float:
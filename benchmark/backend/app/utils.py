@@ -1,20 +1,37 @@
 """Utility helpers for Pydantic compatibility."""
 from __future__ import annotations
 
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+
+@lru_cache(maxsize=256)
+def _resolve(cls: type, *names: str) -> Optional[Callable[..., Any]]:
+    """Return the first of ``names`` defined on ``cls``, looked up once per class."""
+    for name in names:
+        attr = getattr(cls, name, None)
+        if attr is not None:
+            return attr
+    return None
 
 
 def model_dump(model: Any) -> dict:
-    if hasattr(model, "model_dump"):
-        return model.model_dump()
-    if hasattr(model, "dict"):
-        return model.dict()
-    raise TypeError(f"Object {model!r} does not support model dumping")
+    dump = _resolve(type(model), "model_dump", "dict")
+    if dump is None:
+        raise TypeError(f"Object {model!r} does not support model dumping")
+    return dump(model)
 
 
 def model_copy(model: Any, *, update: dict) -> Any:
-    if hasattr(model, "model_copy"):
-        return model.model_copy(update=update)
-    if hasattr(model, "copy"):
-        return model.copy(update=update)
-    raise TypeError(f"Object {model!r} does not support model copying")
+    copy = _resolve(type(model), "model_copy", "copy")
+    if copy is None:
+        raise TypeError(f"Object {model!r} does not support model copying")
+    return copy(model, update=update)
+
+
+def model_construct(model_cls: Any, **fields: Any) -> Any:
+    """Build ``model_cls`` from already-validated ``fields`` without re-validating them."""
+    construct = _resolve(model_cls, "model_construct", "construct")
+    if construct is None:
+        raise TypeError(f"Object {model_cls!r} does not support model construction")
+    return construct(**fields)
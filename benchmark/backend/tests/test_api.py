@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.benchmark import SweepResult
+from app.schemas import BenchmarkProvider, BenchmarkResult
+
+client = TestClient(app)
+started_at = datetime(2024, 1, 1, 12, 0, 0)
+completed_at = datetime(2024, 1, 1, 12, 0, 5, 250)
+
+
+@pytest.mark.parametrize("encoding", ["gzip, deflate", "identity"])
+def test_list_backends_serves_catalog(encoding: str) -> None:
+    response = client.get("/api/backends", headers={"Accept-Encoding": encoding})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    backends = response.json()
+    assert [backend["provider"] for backend in backends] == ["ollama", "nim", "vllm", "llamacpp"]
+    assert all(backend["default_base_url"].startswith("http") for backend in backends)
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert response.headers.get("content-encoding") == ("gzip" if "gzip" in encoding else None)
+
+
+@pytest.mark.parametrize(
+    "encoding, gzipped",
+    [
+        ("gzip;q=0", False),
+        ("gzip;q=0.5, identity", True),
+        ("br, *;q=0.1", True),
+        ("*;q=0, br", False),
+    ],
+)
+def test_list_backends_honours_accept_encoding_quality(encoding: str, gzipped: bool) -> None:
+    response = client.get("/api/backends", headers={"Accept-Encoding": encoding})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == ("gzip" if gzipped else None)
+    assert response.json()[0]["provider"] == "ollama"
+
+
+def test_list_backends_revalidates_with_etag() -> None:
+    etag = client.get("/api/backends").headers["etag"]
+
+    response = client.get("/api/backends", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert client.get("/api/backends", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_health_check() -> None:
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_auto_benchmark_streams_ndjson(monkeypatch) -> None:
+    async def fake_run_auto(request, sweep=None):
+        # Completion order differs from grid order when combinations run in parallel.
+        for index in (1, 0):
+            result = BenchmarkResult(
+                run_id=0,
+                provider=BenchmarkProvider.NIM,
+                model_name="demo",
+                parameters={"prompt": "hi", "parameters": {"concurrency": index + 1}},
+                metrics={"latency_p95_ms": 10.0 * index},
+            )
+            yield SweepResult(index, result, started_at=started_at, completed_at=completed_at)
+
+    monkeypatch.setattr(main.service, "run_auto", fake_run_auto)
+    payload = {"provider": "nim", "model_name": "demo", "prompt": "hi"}
+    response = client.post("/api/benchmarks/auto", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["combination"] for row in rows] == [1, 0]
+    assert [row["parameters"] for row in rows] == [{"concurrency": 2}, {"concurrency": 1}]
+    assert rows[1]["provider"] == "nim"
+    assert rows[0]["metrics"] == {"latency_p95_ms": 10.0}
+    # Same format as the history endpoints: naive UTC with microseconds.
+    assert rows[0]["created_at"] == "2024-01-01T12:00:00.000000"
+    assert rows[0]["completed_at"] == "2024-01-01T12:00:05.000250"
+
+
+def test_auto_benchmark_rejects_invalid_grid_before_streaming() -> None:
+    payload = {"provider": "nim", "model_name": "demo", "prompt": "hi", "sweep_concurrency": [0]}
+    response = client.post("/api/benchmarks/auto", json=payload)
+
+    assert response.status_code == 422
+    assert "concurrency" in response.json()["detail"]
+
+
+def test_auto_benchmark_reports_mid_stream_failure(monkeypatch) -> None:
+    async def failing_run_auto(request, sweep=None):
+        result = BenchmarkResult(
+            run_id=0,
+            provider=BenchmarkProvider.NIM,
+            model_name="demo",
+            parameters={"parameters": {}},
+            metrics={},
+        )
+        yield SweepResult(0, result, started_at=started_at, completed_at=completed_at)
+        raise RuntimeError("backend went away")
+
+    monkeypatch.setattr(main.service, "run_auto", failing_run_auto)
+    payload = {"provider": "nim", "model_name": "demo", "prompt": "hi"}
+    response = client.post("/api/benchmarks/auto", json=payload)
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows[0]["combination"] == 0
+    assert rows[-1] == {"error": "backend went away"}
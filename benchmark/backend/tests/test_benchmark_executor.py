@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from app.benchmark import (
+    BenchmarkExecutor,
+    _shared_http_client,
+    close_shared_clients,
+    run_auto_benchmark,
+)
+from app.clients.base import BackendClient, RequestMetrics
+from app.schemas import (
+    AutoBenchmarkRequest,
+    BackendSpecificParameters,
+    BenchmarkParameters,
+    BenchmarkProvider,
+    BenchmarkRequest,
+)
+
+
+class FakeClient(BackendClient):
+    def __init__(self, parameters: BenchmarkParameters, fail_on: int | None = None) -> None:
+        super().__init__(
+            base_url="http://backend.local",
+            model_name="demo",
+            parameters=parameters,
+            backend_parameters=BackendSpecificParameters(),
+            timeout=5.0,
+        )
+        self.fail_on = fail_on
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def warm_pool(self, client: Any, connections: int) -> None:
+        return None
+
+    async def _generate(self, prompt: str, client: Any) -> Dict[str, Any]:
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("backend failure")
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return {"response": prompt, "eval_count": 3}
+
+
+def make_executor(fake: FakeClient) -> BenchmarkExecutor:
+    request = BenchmarkRequest(
+        provider=BenchmarkProvider.OLLAMA,
+        model_name="demo",
+        prompt="hello",
+        parameters=fake.parameters,
+    )
+    return BenchmarkExecutor(request, reuse_client=False, client=fake)
+
+
+@pytest.mark.asyncio
+async def test_iter_metrics_bounds_concurrency() -> None:
+    fake = FakeClient(BenchmarkParameters(request_count=25, concurrency=3, warmup_requests=0))
+    metrics = [item async for item in make_executor(fake).iter_metrics()]
+
+    assert len(metrics) == 25
+    assert all(isinstance(item, RequestMetrics) for item in metrics)
+    assert fake.peak_in_flight <= 3
+
+
+@pytest.mark.asyncio
+async def test_iter_metrics_propagates_failures() -> None:
+    fake = FakeClient(
+        BenchmarkParameters(request_count=10, concurrency=2, warmup_requests=0),
+        fail_on=4,
+    )
+    with pytest.raises(RuntimeError, match="backend failure"):
+        async for _ in make_executor(fake).iter_metrics():
+            pass
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('["a", "b", "c"]', ["a", "b"]),
+        ('```json\n["a", " ", "b"]\n```', ["a", "b"]),
+        ('Here are your prompts: ["x", "y"] enjoy', ["x", "y"]),
+        ("- first\n* second\n• third", ["first", "second"]),
+        ("", []),
+    ],
+)
+def test_extract_prompt_list(text: str, expected: list) -> None:
+    assert BenchmarkExecutor._extract_prompt_list(text, 2) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parallelism", [1, 3])
+async def test_run_auto_benchmark_covers_grid(
+    monkeypatch: pytest.MonkeyPatch, parallelism: int
+) -> None:
+    created: list = []
+
+    def _create_client(provider: Any, **kwargs: Any) -> FakeClient:
+        fake = FakeClient(kwargs["parameters"])
+        created.append(fake)
+        return fake
+
+    monkeypatch.setattr("app.benchmark.create_client", _create_client)
+    request = AutoBenchmarkRequest(
+        provider=BenchmarkProvider.OLLAMA,
+        model_name="demo",
+        prompt="hello",
+        sweep_concurrency=[1, 2],
+        sweep_max_tokens=[16, 32],
+        sweep_temperature=[0.1],
+        sweep_parallelism=parallelism,
+        parameters=BenchmarkParameters(request_count=4, warmup_requests=0),
+    )
+
+    results = [result async for result in run_auto_benchmark(request)]
+    await close_shared_clients()
+
+    combos = {
+        swept.index: (
+            swept.result.parameters["parameters"]["concurrency"],
+            swept.result.parameters["parameters"]["max_tokens"],
+        )
+        for swept in results
+    }
+    assert combos == {0: (1, 16), 1: (1, 32), 2: (2, 16), 3: (2, 32)}
+    assert all(swept.result.metrics["requests_total"] == 4 for swept in results)
+    assert all(swept.started_at <= swept.completed_at for swept in results)
+    assert len(created) == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_concurrently_within_limit() -> None:
+    fake = FakeClient(BenchmarkParameters(concurrency=2, warmup_requests=5))
+    await fake.warmup("hello", None)
+
+    assert fake.calls == 5
+    assert fake.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_http_clients_evict_idle_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.benchmark.MAX_SHARED_HTTP_CLIENTS", 1)
+
+    async with _shared_http_client("http://a.local", 5.0, 4, 4, False) as first:
+        async with _shared_http_client("http://b.local", 5.0, 4, 4, False) as second:
+            pass
+        # The cap is exceeded, but the only idle client is the newer one.
+        assert second.is_closed
+        assert not first.is_closed
+    assert not first.is_closed
+
+    async with _shared_http_client("http://c.local", 5.0, 4, 4, False):
+        pass
+    assert first.is_closed
+    await close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_run_auto_benchmark_keeps_a_window_and_awaits_cancelled_runs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "app.benchmark.create_client", lambda provider, **kwargs: FakeClient(kwargs["parameters"])
+    )
+    in_flight = 0
+    peak = 0
+    started = 0
+    unwound = 0
+
+    async def _run(self: BenchmarkExecutor, run_id: int = 0) -> Any:
+        nonlocal in_flight, peak, started, unwound
+        started += 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.01 * started)
+            return started
+        finally:
+            in_flight -= 1
+            unwound += 1
+
+    monkeypatch.setattr(BenchmarkExecutor, "run", _run)
+    request = AutoBenchmarkRequest(
+        provider=BenchmarkProvider.OLLAMA,
+        model_name="demo",
+        prompt="hello",
+        sweep_concurrency=[1, 2, 3],
+        sweep_max_tokens=[16, 32],
+        sweep_temperature=[0.1],
+        sweep_parallelism=2,
+    )
+
+    results = run_auto_benchmark(request)
+    await results.__anext__()
+    await results.aclose()
+
+    assert peak == 2
+    assert started < 6
+    assert unwound == started
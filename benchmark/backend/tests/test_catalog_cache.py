@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.catalog_cache import CatalogCache
+from app.schemas import ModelInfo
+
+
+def make_fetch(names: List[str], calls: List[str]):
+    async def fetch() -> List[ModelInfo]:
+        calls.append("fetch")
+        if not names:
+            raise RuntimeError("upstream down")
+        return [ModelInfo(name=names.pop(0))]
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = CatalogCache(ttl_s=10)
+    calls: List[str] = []
+    fetch = make_fetch(["v1", "v2"], calls)
+    now = [100.0]
+    monkeypatch.setattr("app.catalog_cache.time.monotonic", lambda: now[0])
+
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v1"]
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v1"]
+    assert calls == ["fetch"]
+
+    now[0] += 11
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v1"]
+    await asyncio.sleep(0)
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v2"]
+
+    # A failed refresh keeps the stale copy instead of surfacing the error.
+    now[0] += 11
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v2"]
+    await asyncio.sleep(0)
+    assert [m.name for m in await cache.get_or_fetch("nim", "k", fetch)] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_disk_entries_survive_restart_until_invalidated(tmp_path: Path) -> None:
+    calls: List[str] = []
+    await CatalogCache(ttl_s=60, directory=tmp_path).get_or_fetch(
+        "nim", "k", make_fetch(["v1"], calls)
+    )
+
+    restarted = CatalogCache(ttl_s=60, directory=tmp_path)
+    models = await restarted.get_or_fetch("nim", "k", make_fetch([], calls))
+    assert [model.name for model in models] == ["v1"]
+    assert calls == ["fetch"]
+
+    restarted.invalidate("nim")
+    assert not list(tmp_path.glob("nim_*.json"))
+    with pytest.raises(RuntimeError):
+        await restarted.get_or_fetch("nim", "k", make_fetch([], calls))
+
+
+def test_key_for_ignores_dict_order() -> None:
+    first = CatalogCache.key_for({"query": "llama", "limit": 10, "path": Path("/models")})
+    second = CatalogCache.key_for({"path": Path("/models"), "limit": 10, "query": "llama"})
+
+    assert first == second
+    assert first != CatalogCache.key_for({"query": "llama", "limit": 20, "path": Path("/models")})
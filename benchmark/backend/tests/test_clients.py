@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from app.clients.base import TokenTimer, request_with_retry
+from app.clients.llamacpp import LlamaCppClient
+from app.clients.nim import NimClient
+from app.clients.ollama import OllamaClient
+from app.clients.vllm import VllmClient
+from app.schemas import BackendSpecificParameters, BenchmarkParameters
+
+
+def make_client(client_cls, **parameters):
+    return client_cls(
+        base_url="http://backend.local/",
+        model_name="demo",
+        parameters=BenchmarkParameters(**parameters),
+        backend_parameters=BackendSpecificParameters(),
+        timeout=5.0,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "client_cls, path",
+    [(OllamaClient, "/api/tags"), (LlamaCppClient, "/health")],
+)
+async def test_warm_pool_hits_provider_endpoint(client_cls, path: str) -> None:
+    seen: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(503)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        await make_client(client_cls).warm_pool(http_client, 3)
+
+    assert seen == [path] * 3
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ({"eval_count": 12}, 12),
+        ({"tokens": 3, "eval_count": 12}, 3),
+        ({"tokens": "n/a", "usage": {"completion_tokens": 7}}, 7),
+        ({"usage": {"total_tokens": 9, "completion_tokens": 7}}, 9),
+        ({}, 0),
+    ],
+)
+def test_extract_token_count(response: dict, expected: int) -> None:
+    assert make_client(OllamaClient)._extract_token_count(response) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("capture, expected", [(False, ""), (True, "hello there")])
+async def test_generate_only_keeps_completion_when_requested(capture: bool, expected: str) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"response": "hello there", "eval_count": 2})
+
+    client = make_client(OllamaClient, stream=False)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        metrics = await client.generate("hi", http_client, capture_completion=capture)
+
+    assert metrics.completion == expected
+    assert metrics.tokens_generated == 2
+    assert metrics.raw_response is None
+
+
+@pytest.mark.asyncio
+async def test_generate_records_backend_latency_separately() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = {
+            "choices": [{"message": {"content": "ok"}}],
+            "timings": {"prompt_ms": 12.5, "predicted_ms": 87.5},
+            "usage": {"completion_tokens": 4},
+        }
+        return httpx.Response(200, json=payload)
+
+    client = make_client(LlamaCppClient, stream=False)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        metrics = await client.generate("hi", http_client)
+
+    assert metrics.server_latency_ms == pytest.approx(100.0)
+    assert metrics.latency_ms != pytest.approx(100.0)
+    assert metrics.tokens_generated == 4
+
+
+@pytest.mark.asyncio
+async def test_llamacpp_payload_tracks_updated_parameters() -> None:
+    bodies: List[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    client = make_client(LlamaCppClient, stream=False, max_tokens=32)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        await client.generate("first", http_client)
+        client.update_parameters(BenchmarkParameters(stream=False, max_tokens=64))
+        await client.generate("second", http_client)
+
+    assert [body["max_tokens"] for body in bodies] == [32, 64]
+    assert bodies[1]["messages"] == [{"role": "user", "content": "second"}]
+    assert bodies[1]["options"] == {"repeat_penalty": 1.0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_cls", [NimClient, VllmClient])
+async def test_completions_payload_tracks_updated_parameters(client_cls) -> None:
+    bodies: List[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/completions"
+        assert request.headers["content-type"] == "application/json"
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"text": "ok"}]})
+
+    client = make_client(client_cls, stream=False, max_tokens=32)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        await client.generate("first", http_client)
+        client.update_parameters(BenchmarkParameters(stream=False, max_tokens=64))
+        await client.generate("second", http_client)
+
+    assert [body["max_tokens"] for body in bodies] == [32, 64]
+    assert [body["prompt"] for body in bodies] == ["first", "second"]
+    assert all(body["stream"] is False for body in bodies)
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_retries_then_raises_last_error() -> None:
+    attempts: List[int] = []
+
+    async def _flaky() -> str:
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise httpx.ConnectError(f"attempt {len(attempts)}")
+        return "ok"
+
+    assert await request_with_retry(_flaky, retries=2, backoff=0) == "ok"
+
+    async def _broken() -> str:
+        attempts.append(len(attempts))
+        raise httpx.ConnectError(f"attempt {len(attempts)}")
+
+    attempts.clear()
+    with pytest.raises(httpx.ConnectError, match="attempt 3"):
+        await request_with_retry(_broken, retries=2, backoff=0)
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_raises_non_transport_errors_immediately() -> None:
+    attempts: List[int] = []
+
+    async def _invalid() -> str:
+        attempts.append(len(attempts))
+        raise ValueError("unparseable response")
+
+    with pytest.raises(ValueError, match="unparseable"):
+        await request_with_retry(_invalid, retries=3, backoff=0)
+    assert attempts == [0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, expected_attempts", [(429, 2), (400, 1)])
+async def test_request_with_retry_only_retries_transient_statuses(
+    status: int, expected_attempts: int
+) -> None:
+    attempts: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def _send(http_client: httpx.AsyncClient) -> dict:
+        response = await http_client.get("http://backend.local/")
+        response.raise_for_status()
+        return response.json()
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        if status == 400:
+            with pytest.raises(httpx.HTTPStatusError):
+                await request_with_retry(_send, http_client)
+        else:
+            assert await request_with_retry(_send, http_client) == {"ok": True}
+
+    assert len(attempts) == expected_attempts
+
+
+def test_token_timer_reports_milliseconds(monkeypatch) -> None:
+    readings = iter([0, 5_000_000, 7_000_000, 11_000_000, 20_000_000])
+    monkeypatch.setattr("app.clients.base.time.perf_counter_ns", lambda: next(readings))
+
+    timer = TokenTimer()
+    for _ in range(3):
+        timer.mark_token()
+
+    assert timer.finish() == pytest.approx((20.0, 5.0, 3.0))
+
+
+SSE_STREAM = (
+    b": keep-alive\n\n"
+    b'data: {"choices": [{"text": "Hel"}]}\n\n'
+    b"event: telemetry\n"
+    b'data: {"gpu_util": 0.9}\n\n'
+    b'data: {"choices": [{"text": "lo"}], "usage": {"completion_tokens": 5}}\r\n\r\n'
+    b"data: [DONE]\n\n"
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_cls", [NimClient, VllmClient, LlamaCppClient])
+async def test_stream_generate_parses_sse(client_cls) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=SSE_STREAM)
+
+    client = make_client(client_cls, keep_raw_responses=True)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        metrics = await client.generate("hi", http_client, capture_completion=True)
+
+    assert metrics.completion == "Hello"
+    assert metrics.tokens_generated == 5
+    assert metrics.ttft_ms <= metrics.latency_ms
+    assert metrics.raw_response["stream"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_cls", [NimClient, VllmClient, LlamaCppClient, OllamaClient])
+async def test_stream_generate_drops_chunks_unless_kept(client_cls) -> None:
+    body = b'{"response": "Hi", "done": true}\n' if client_cls is OllamaClient else SSE_STREAM
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body)
+
+    client = make_client(client_cls)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        metrics = await client.generate("hi", http_client)
+        assert metrics.raw_response is None
+        assert metrics.tokens_generated > 0
+
+    # An empty stream is still detected and falls back to a non-streaming request.
+    streamed: List[bool] = []
+
+    def empty_stream(request: httpx.Request) -> httpx.Response:
+        streamed.append(json.loads(request.content)["stream"])
+        if streamed[-1]:
+            return httpx.Response(200)
+        return httpx.Response(200, json={"choices": [{"text": "ok"}], "eval_count": 1})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(empty_stream)) as http_client:
+        metrics = await client.generate("hi", http_client)
+    assert streamed == [True, False]
+    assert metrics.tokens_generated == 1
+
+
+@pytest.mark.asyncio
+async def test_ollama_stream_generate_parses_ndjson() -> None:
+    body = (
+        b'{"response": "Hel", "done": false}\n'
+        b'{"response": "lo", "done": false}\n'
+        b'{"response": "", "done": true, "eval_count": 2}'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body)
+
+    client = make_client(OllamaClient)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        metrics = await client.generate("hi", http_client, capture_completion=True)
+
+    assert metrics.completion == "Hello"
+    assert metrics.tokens_generated == 2
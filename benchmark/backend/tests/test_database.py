@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.database import Base, _engine_options
+from app.models import BenchmarkRun
+from app.schemas import BenchmarkProvider
+
+
+def test_json_columns_round_trip_through_engine_serializer() -> None:
+    engine = create_engine("sqlite://", future=True, **_engine_options("sqlite://"))
+    Base.metadata.create_all(bind=engine)
+    metrics = {"latency_p95_ms": 12.5, "tokens_total": 40, "labels": ["a", "é"]}
+
+    with Session(engine) as session:
+        run = BenchmarkRun(
+            provider=BenchmarkProvider.OLLAMA,
+            model_name="demo",
+            prompt="hi",
+            parameters={},
+            metrics=metrics,
+        )
+        session.add(run)
+        session.commit()
+        stored = session.execute(
+            select(func.json_extract(BenchmarkRun.metrics, "$.latency_p95_ms"))
+        ).scalar_one()
+        session.expire_all()
+        assert session.get(BenchmarkRun, run.id).metrics == metrics
+    assert stored == 12.5
@@ -1,14 +1,25 @@
+import asyncio
+import json
+import sys
+from datetime import datetime
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Callable, List
 
 import httpx
 import pytest
 from fastapi import HTTPException
 
-from app.model_registry import ModelRegistryService
+from app import model_registry
+from app.model_registry import (
+    ModelRegistryService,
+    ModelRuntimeService,
+    _format_size,
+    _run_command,
+)
 from app.schemas import (
     HuggingFaceDownloadRequest,
     HuggingFaceSearchRequest,
+    ModelRuntimeRequest,
     NgcCliModelRequest,
     NimPullRequest,
     NimSearchRequest,
@@ -17,10 +28,17 @@ from app.schemas import (
 from app.settings import Settings
 
 
+@pytest.fixture(autouse=True)
+def _clear_executable_cache() -> None:
+    model_registry._executables.clear()
+
+
 class StubResponse:
-    def __init__(self, payload: Any, status_code: int = 200) -> None:
+    def __init__(self, payload: Any, status_code: int = 200, headers: Any = None) -> None:
         self._payload = payload
         self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.headers = httpx.Headers(headers or {})
 
     def json(self) -> Any:  # pragma: no cover - trivial
         return self._payload
@@ -34,6 +52,7 @@ def make_async_client(responses: List[StubResponse]):
     class _AsyncClient:
         def __init__(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover - simple holder
             self._responses = list(responses)
+            self.requests: List[dict] = []
 
         async def __aenter__(self) -> "_AsyncClient":
             return self
@@ -42,6 +61,7 @@ def make_async_client(responses: List[StubResponse]):
             return None
 
         async def get(self, *args: Any, **kwargs: Any) -> StubResponse:
+            self.requests.append(kwargs)
             return self._responses.pop(0)
 
         async def post(self, *args: Any, **kwargs: Any) -> StubResponse:
@@ -55,13 +75,46 @@ async def test_list_ollama_models(monkeypatch: pytest.MonkeyPatch) -> None:
     settings = Settings()
     service = ModelRegistryService(settings)
 
-    response = StubResponse({"models": [{"name": "llama3", "size": 1048576}]})
+    response = StubResponse(
+        {
+            "models": [
+                {"name": "llama3", "size": 1048576, "digest": "abc", "details": {"family": "llama"}}
+            ]
+        }
+    )
     monkeypatch.setattr("app.model_registry.httpx.AsyncClient", make_async_client([response]))
 
     models = await service.list_ollama_models()
     assert len(models) == 1
     assert models[0].name == "llama3"
     assert models[0].size is not None
+    assert models[0].digest == "abc"
+    assert models[0].description is None
+
+
+@pytest.mark.asyncio
+async def test_list_ollama_models_revalidates_parsed_tags(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = ModelRegistryService(Settings(catalog_cache_ttl=0))
+
+    tags = {"models": [{"name": "llama3"}]}
+    responses = [
+        StubResponse(tags, headers={"ETag": '"v1"'}),
+        StubResponse(None, status_code=304),
+        StubResponse(tags),
+    ]
+    monkeypatch.setattr("app.model_registry.httpx.AsyncClient", make_async_client(responses))
+    parsed: List[dict] = []
+    parse = model_registry._ollama_model_info
+    monkeypatch.setattr(
+        "app.model_registry._ollama_model_info", lambda item: parsed.append(item) or parse(item)
+    )
+
+    for _ in range(3):
+        models = await service.list_ollama_models()
+        assert [model.name for model in models] == ["llama3"]
+
+    assert len(parsed) == 1
+    assert service._client().requests[1]["headers"] == {"If-None-Match": '"v1"'}
 
 
 @pytest.mark.asyncio
@@ -87,6 +140,34 @@ async def test_search_nim_models_requires_key() -> None:
     assert exc.value.status_code == 400
 
 
+@pytest.mark.asyncio
+async def test_search_nim_models_fetches_capped_pages_concurrently() -> None:
+    service = ModelRegistryService(Settings(ngc_catalog_cache_ttl=0))
+    pages: List[str] = []
+    rate_limited = [True]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page", "0")
+        if page == "2" and rate_limited:
+            rate_limited.pop()
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        pages.append(page)
+        start = int(page) * 2
+        return httpx.Response(
+            200,
+            json={
+                "models": [{"name": f"model-{index}"} for index in range(start, start + 2)],
+                "paginationInfo": {"index": int(page), "size": 2, "totalPages": 4},
+            },
+        )
+
+    service._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    models = await service.search_nim_models(NimSearchRequest(api_key="key", limit=5))
+
+    assert [model.name for model in models] == [f"model-{index}" for index in range(5)]
+    assert sorted(pages) == ["0", "1", "2"]
+
+
 @pytest.mark.asyncio
 async def test_pull_nim_model_requires_docker(monkeypatch: pytest.MonkeyPatch) -> None:
     settings = Settings()
@@ -99,9 +180,36 @@ async def test_pull_nim_model_requires_docker(monkeypatch: pytest.MonkeyPatch) -
     assert exc.value.status_code == 500
 
 
+@pytest.mark.asyncio
+async def test_pull_nim_models_logs_in_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = ModelRegistryService(Settings())
+    commands: List[List[str]] = []
+
+    async def _fake_run_command(cmd: List[str], input_data: Any = None, **kwargs: Any) -> str:
+        commands.append(cmd)
+        if cmd[-1] == "nvcr.io/nim/broken:latest":
+            raise HTTPException(status_code=500, detail="pull failed")
+        return "pulled"
+
+    monkeypatch.setattr("app.model_registry.shutil.which", lambda _: "/usr/bin/docker")
+    monkeypatch.setattr("app.model_registry._run_command", _fake_run_command)
+
+    responses = await service.pull_nim_models(
+        [
+            NimPullRequest(model_name="nvcr.io/nim/a", api_key="token"),
+            NimPullRequest(model_name="nvcr.io/nim/broken", api_key="token"),
+            NimPullRequest(model_name="nvcr.io/nim/b", tag="1.0", api_key="token"),
+        ]
+    )
+
+    assert [response.status for response in responses] == ["completed", "failed", "completed"]
+    assert [cmd[1] for cmd in commands].count("login") == 1
+    assert ["docker", "pull", "nvcr.io/nim/b:1.0"] in commands
+
+
 @pytest.mark.asyncio
 async def test_download_huggingface_model(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    settings = Settings(model_cache_dir=str(tmp_path))
+    settings = Settings(model_cache_dir=str(tmp_path), hf_download_workers=3)
     service = ModelRegistryService(settings)
 
     called = {}
@@ -120,6 +228,91 @@ async def test_download_huggingface_model(monkeypatch: pytest.MonkeyPatch, tmp_p
     assert result.status == "completed"
     assert "model" in result.metadata["path"]
     assert called["repo_id"] == "meta-llama/Meta-Llama-3-8B"
+    assert called["max_workers"] == 3
+
+
+def _hub_connection_errors() -> List[Any]:
+    """Connection errors snapshot_download can raise, per installed HTTP stack."""
+    errors = [pytest.param(lambda: httpx.ConnectError("connection reset"), id="httpx")]
+    try:
+        import httpx2
+    except ImportError:
+        pass
+    else:
+        errors.append(pytest.param(lambda: httpx2.ConnectError("connection reset"), id="httpx2"))
+    try:
+        import requests
+    except ImportError:
+        pass
+    else:
+        errors.append(
+            pytest.param(lambda: requests.ConnectionError("connection reset"), id="requests")
+        )
+    try:
+        from huggingface_hub.errors import LocalEntryNotFoundError
+    except ImportError:
+        pass
+    else:
+        # The installed hub's own transport error, as chained by snapshot_download.
+        make_cause = errors[-1].values[0]
+
+        def _unreachable_hub() -> Exception:
+            try:
+                raise make_cause()
+            except Exception as cause:
+                try:
+                    raise LocalEntryNotFoundError("cannot locate the files on the Hub") from cause
+                except LocalEntryNotFoundError as exc:
+                    return exc
+
+        errors.append(pytest.param(_unreachable_hub, id="hub-offline"))
+    return errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_error", _hub_connection_errors())
+async def test_download_huggingface_model_retries_transient_errors(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, make_error: Callable[[], Exception]
+) -> None:
+    service = ModelRegistryService(Settings(model_cache_dir=str(tmp_path), hf_fast_transfer=False))
+    attempts: List[int] = []
+
+    def _snapshot_download(**kwargs: Any) -> str:
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise make_error()
+        return str(tmp_path)
+
+    monkeypatch.setattr("app.model_registry.snapshot_download", _snapshot_download)
+    monkeypatch.setattr("app.model_registry.HF_DOWNLOAD_BACKOFF_S", 0)
+
+    request = HuggingFaceDownloadRequest(model_id="org/model", api_key="key")
+    assert (await service.download_huggingface_model(request)).status == "completed"
+    assert len(attempts) == 3
+
+    monkeypatch.setattr("app.model_registry.HF_DOWNLOAD_ATTEMPTS", 1)
+    attempts.clear()
+    with pytest.raises(HTTPException):
+        await service.download_huggingface_model(request)
+    assert len(attempts) == 1
+
+
+@pytest.mark.asyncio
+async def test_download_huggingface_model_does_not_retry_permanent_errors(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    service = ModelRegistryService(Settings(model_cache_dir=str(tmp_path), hf_fast_transfer=False))
+    attempts: List[int] = []
+
+    def _snapshot_download(**kwargs: Any) -> str:
+        attempts.append(len(attempts))
+        raise ValueError("repository not found")
+
+    monkeypatch.setattr("app.model_registry.snapshot_download", _snapshot_download)
+    request = HuggingFaceDownloadRequest(model_id="org/model", api_key="key")
+    with pytest.raises(HTTPException):
+        await service.download_huggingface_model(request)
+    assert len(attempts) == 1
 
 
 @pytest.mark.asyncio
@@ -151,6 +344,21 @@ async def test_search_huggingface_models(monkeypatch: pytest.MonkeyPatch) -> Non
     assert models[0].name == "org/model"
 
 
+def test_fast_hf_transfer_is_enabled_lazily_and_respects_opt_out(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pytest.importorskip("hf_xet")
+    enable = model_registry._enable_fast_hf_transfer.__wrapped__
+
+    monkeypatch.setenv("HF_XET_HIGH_PERFORMANCE", "0")
+    enable()
+    assert model_registry.os.environ["HF_XET_HIGH_PERFORMANCE"] == "0"
+
+    monkeypatch.delenv("HF_XET_HIGH_PERFORMANCE")
+    enable()
+    assert model_registry.os.environ["HF_XET_HIGH_PERFORMANCE"] == "1"
+
+
 @pytest.mark.asyncio
 async def test_setup_ngc_cli_model(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     settings = Settings(model_cache_dir=str(tmp_path))
@@ -205,3 +413,140 @@ async def test_setup_ngc_cli_model_invalid_binary(monkeypatch: pytest.MonkeyPatc
         )
 
     assert "could not be executed" in str(excinfo.value.detail)
+
+
+@pytest.mark.asyncio
+async def test_list_ollama_models_is_cached_until_pull(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = ModelRegistryService(Settings())
+
+    responses = [
+        StubResponse({"models": [{"name": "llama3"}]}),
+        StubResponse({"status": "success"}),
+        StubResponse({"models": [{"name": "llama3"}, {"name": "llama2"}]}),
+    ]
+    monkeypatch.setattr("app.model_registry.httpx.AsyncClient", make_async_client(responses))
+
+    first = await service.list_ollama_models()
+    assert [model.name for model in await service.list_ollama_models()] == ["llama3"]
+    assert first is not await service.list_ollama_models()
+
+    await service.pull_ollama_model(OllamaPullRequest(model_name="llama2"))
+    models = await service.list_ollama_models()
+    assert [model.name for model in models] == ["llama3", "llama2"]
+
+
+def test_which_caches_only_found_executables(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups: List[str] = []
+    found = {"docker": "/usr/bin/docker"}
+    monkeypatch.setattr(
+        "app.model_registry.shutil.which", lambda name: lookups.append(name) or found.get(name)
+    )
+
+    assert model_registry._which("docker") == "/usr/bin/docker"
+    assert model_registry._which("docker") == "/usr/bin/docker"
+    assert model_registry._which("ngc") is None
+    found["ngc"] = "/usr/local/bin/ngc"
+    assert model_registry._which("ngc") == "/usr/local/bin/ngc"
+    assert lookups == ["docker", "ngc", "ngc"]
+
+
+@pytest.mark.asyncio
+async def test_run_command_keeps_output_tail(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(model_registry, "COMMAND_OUTPUT_TAIL_LINES", 3)
+    script = (
+        "import sys\n"
+        "secret = sys.stdin.readline().strip()\n"
+        "for i in range(10): print(i)\n"
+        "print(secret, file=sys.stderr)\n"
+    )
+    output = await _run_command([sys.executable, "-u", "-c", script], input_data="key\n")
+    assert output == "8\n9\nkey"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _run_command([sys.executable, "-c", "import sys; print('boom'); sys.exit(1)"])
+    assert exc_info.value.detail.endswith("failed: boom")
+
+
+@pytest.mark.asyncio
+async def test_run_command_handles_lines_past_stream_limit() -> None:
+    # Progress bars redraw with "\r" and can exceed StreamReader's 64 KiB line limit.
+    script = "import sys; sys.stdout.write('x' * 70000 + '\\r10%\\r20%'); print(); print('done')"
+    output = await _run_command([sys.executable, "-c", script])
+    assert output.splitlines() == ["x" * 70000, "10%", "20%", "done"]
+
+
+@pytest.mark.asyncio
+async def test_run_command_kills_child_on_cancel() -> None:
+    slots = model_registry._command_slots._value
+    task = asyncio.create_task(_run_command([sys.executable, "-c", "import time; time.sleep(60)"]))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, timeout=5)
+    assert model_registry._command_slots._value == slots
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        (0, "0.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KB"),
+        (1048575, "1024.0 KB"),
+        (1536 * 1024**2, "1.5 GB"),
+        (2 * 1024**5, "2048.0 TB"),
+        ("4 GB", "4 GB"),
+    ],
+)
+def test_format_size(value: Any, expected: Any) -> None:
+    assert _format_size(value) == expected
+
+
+@pytest.mark.asyncio
+async def test_list_runtimes_orders_by_most_recent_start() -> None:
+    service = ModelRuntimeService(Settings())
+
+    await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="a"))
+    await service.start_model(ModelRuntimeRequest(provider="nim", model_name="b"))
+    await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="a"))
+    listed = await service.list_runtimes()
+    assert [runtime.model_name for runtime in listed.runtimes] == ["a", "b"]
+
+    await service.stop_model(ModelRuntimeRequest(provider="nim", model_name="b"))
+    listed = await service.list_runtimes()
+    assert [runtime.model_name for runtime in listed.runtimes] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_runtime_started_at_is_utc_with_microseconds() -> None:
+    service = ModelRuntimeService(Settings())
+
+    await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="a"))
+    started_at = (await service.list_runtimes()).runtimes[0].started_at
+
+    # e.g. 2024-01-01T12:00:00.000123, the format the history endpoints use
+    assert len(started_at) == 26
+    assert datetime.fromisoformat(started_at).tzinfo is None
+
+
+@pytest.mark.asyncio
+async def test_runtime_tracking_rejects_new_starts_past_cap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.model_registry.MAX_TRACKED_RUNTIMES", 2)
+    service = ModelRuntimeService(Settings())
+
+    for name in ("a", "b"):
+        await service.start_model(ModelRuntimeRequest(provider="ollama", model_name=name))
+    with pytest.raises(HTTPException) as exc_info:
+        await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="c"))
+    assert exc_info.value.status_code == 409
+
+    # Restarting a tracked model and starting after a stop are still allowed.
+    await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="a"))
+    await service.stop_model(ModelRuntimeRequest(provider="ollama", model_name="b"))
+    await service.start_model(ModelRuntimeRequest(provider="ollama", model_name="c"))
+
+    listed = await service.list_runtimes()
+    assert [runtime.model_name for runtime in listed.runtimes] == ["c", "a"]
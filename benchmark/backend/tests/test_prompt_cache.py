@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.prompt_cache import PromptCache
+from app.settings import Settings
+
+
+@pytest.mark.asyncio
+async def test_load_or_generate_persists_prompts(tmp_path: Path) -> None:
+    calls = 0
+
+    async def _generate() -> list:
+        nonlocal calls
+        calls += 1
+        return ["first", "second"]
+
+    key = PromptCache.make_key("ollama", "http://localhost:11434", "llama3", "", 2)
+    cache = PromptCache(tmp_path / "prompts.json")
+    assert await cache.load_or_generate(key, _generate) == ["first", "second"]
+    assert await cache.load_or_generate(key, _generate) == ["first", "second"]
+
+    reloaded = PromptCache(tmp_path / "prompts.json")
+    assert await reloaded.load_or_generate(key, _generate) == ["first", "second"]
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_generates(tmp_path: Path) -> None:
+    cache = PromptCache.from_settings(Settings(prompt_cache_mode="none"))
+    calls = 0
+
+    async def _generate() -> list:
+        nonlocal calls
+        calls += 1
+        return ["prompt"]
+
+    await cache.load_or_generate("key", _generate)
+    await cache.load_or_generate("key", _generate)
+    assert calls == 2
+    assert cache.path is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_generation(tmp_path: Path) -> None:
+    calls = 0
+
+    async def _generate() -> list:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["shared"]
+
+    cache = PromptCache(tmp_path / "prompts.json")
+    results = await asyncio.gather(*(cache.load_or_generate("key", _generate) for _ in range(5)))
+
+    assert results == [["shared"]] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_regenerated(tmp_path: Path, monkeypatch) -> None:
+    calls = 0
+
+    async def _generate() -> list:
+        nonlocal calls
+        calls += 1
+        return [f"prompt-{calls}"]
+
+    cache = PromptCache(tmp_path / "prompts.json", ttl_s=60.0)
+    assert await cache.load_or_generate("key", _generate) == ["prompt-1"]
+    assert await cache.load_or_generate("key", _generate) == ["prompt-1"]
+
+    now = time.time()
+    monkeypatch.setattr("app.prompt_cache.time.time", lambda: now + 61.0)
+    assert await cache.load_or_generate("key", _generate) == ["prompt-2"]
+
+
+def test_cache_is_disabled_by_default() -> None:
+    assert PromptCache.from_settings(Settings()).path is None
+
+
+def test_unknown_cache_mode_rejected() -> None:
+    with pytest.raises(ValueError):
+        PromptCache.from_settings(Settings(prompt_cache_mode="redis"))
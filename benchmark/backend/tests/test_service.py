@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import BenchmarkRun, Counter, seed_counters
+from app.schemas import BenchmarkProvider, BenchmarkRequest, BenchmarkResult
+from app.service import RUN_COUNT, BenchmarkService
+
+
+@pytest.fixture
+def service(monkeypatch) -> BenchmarkService:
+    svc = BenchmarkService()
+    svc.queries = []
+
+    async def list_runs_with_total(limit: int = 20, offset: int = 0, cursor=None):
+        svc.queries.append(f"page:{limit}:{offset}")
+        return [], 0
+
+    monkeypatch.setattr(svc, "list_runs_with_total", list_runs_with_total)
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_list_history_reuses_recent_page(service: BenchmarkService) -> None:
+    first = await service.list_history(limit=10, offset=0)
+    second = await service.list_history(limit=10, offset=0)
+
+    assert second is first
+    assert service.queries == ["page:10:0"]
+
+
+@pytest.mark.asyncio
+async def test_list_history_refreshes_after_invalidation(service: BenchmarkService) -> None:
+    await service.list_history(limit=10, offset=0)
+    service._invalidate_history()
+    await service.list_history(limit=10, offset=0)
+    await service.list_history(limit=10, offset=10)
+
+    assert service.queries == ["page:10:0"] * 2 + ["page:10:10"]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    engine = create_engine(
+        "sqlite://", future=True, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    seed_counters(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_session():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    monkeypatch.setattr("app.service.get_session", get_session)
+    return get_session
+
+
+@pytest.mark.asyncio
+async def test_count_runs_tracks_inserts(database) -> None:
+    svc = BenchmarkService()
+    request = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+
+    await svc.create_run(request)
+    assert await svc.count_runs() == 1
+
+    await svc.create_run(request)
+    await svc.create_run(request)
+    assert await svc.count_runs() == 3
+    with database() as session:
+        assert session.get(Counter, RUN_COUNT).value == 3
+
+
+def test_seed_counters_is_safe_to_run_concurrently(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory.begin() as session:
+        for _ in range(4):
+            session.add(
+                BenchmarkRun(
+                    provider=BenchmarkProvider.OLLAMA, model_name="demo", prompt="hi", parameters={}
+                )
+            )
+
+    errors = []
+
+    def seed() -> None:
+        try:
+            seed_counters(engine)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=seed) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with factory() as session:
+        assert session.get(Counter, RUN_COUNT).value == 4
+
+
+@pytest.mark.asyncio
+async def test_count_runs_counts_table_when_unseeded(database) -> None:
+    svc = BenchmarkService()
+    request = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    await svc.create_run(request)
+    with database() as session:
+        session.delete(session.get(Counter, RUN_COUNT))
+
+    await svc.create_run(request)
+    assert await svc.count_runs() == 2
+    with database() as session:
+        assert session.get(Counter, RUN_COUNT) is None
+
+
+@pytest.mark.asyncio
+async def test_list_history_cursor_walks_every_run_once(database) -> None:
+    svc = BenchmarkService()
+    request = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    for _ in range(5):
+        await svc.create_run(request)
+
+    seen = []
+    cursor = None
+    while True:
+        page = await svc.list_history(limit=2, cursor=cursor)
+        seen.extend(run.id for run in page.runs)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [5, 4, 3, 2, 1]
+    with pytest.raises(ValueError):
+        await svc.list_runs(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_runs_with_total_reads_counter(database) -> None:
+    svc = BenchmarkService()
+    request = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    for _ in range(3):
+        await svc.create_run(request)
+
+    runs, total = await svc.list_runs_with_total(limit=2)
+    assert [run.id for run in runs] == [3, 2]
+    assert total == 3
+
+    runs, total = await svc.list_runs_with_total(limit=2, offset=5)
+    assert runs == []
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_get_run_caches_only_finished_runs(database) -> None:
+    svc = BenchmarkService()
+    request = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    run = await svc.create_run(request)
+
+    assert (await svc.get_run(run.id)).status == "queued"
+    with database() as session:
+        stored = session.get(BenchmarkRun, run.id)
+        stored.status = "completed"
+        stored.metrics = {"latency_p95_ms": 1.0}
+    assert (await svc.get_run(run.id)).status == "completed"
+
+    with database() as session:
+        session.delete(session.get(BenchmarkRun, run.id))
+    cached = await svc.get_run(run.id)
+    assert cached is not None
+    assert cached.metrics == {"latency_p95_ms": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_records_status_transitions(database, monkeypatch) -> None:
+    class StubExecutor:
+        def __init__(self, request) -> None:
+            self.outcome = request.model_name
+
+        async def run(self, run_id: int):
+            if self.outcome == "broken":
+                raise RuntimeError("backend unreachable")
+            return BenchmarkResult(
+                run_id=run_id,
+                provider=BenchmarkProvider.OLLAMA,
+                model_name=self.outcome,
+                parameters={},
+                metrics={"latency_p95_ms": 2.0},
+            )
+
+    monkeypatch.setattr("app.service.BenchmarkExecutor", StubExecutor)
+    svc = BenchmarkService()
+
+    ok = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    run = await svc.create_run(ok)
+    await svc.run_benchmark(run.id, ok)
+    with database() as session:
+        stored = session.get(BenchmarkRun, run.id)
+        assert stored.status == "completed"
+        assert stored.metrics == {"latency_p95_ms": 2.0}
+        assert stored.started_at <= stored.completed_at
+
+    broken = BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="broken")
+    run = await svc.create_run(broken)
+    with pytest.raises(RuntimeError):
+        await svc.run_benchmark(run.id, broken)
+    with database() as session:
+        stored = session.get(BenchmarkRun, run.id)
+        assert (stored.status, stored.error) == ("failed", "backend unreachable")
+
+
+@pytest.mark.asyncio
+async def test_create_run_returns_populated_run(database) -> None:
+    svc = BenchmarkService()
+    run = await svc.create_run(
+        BenchmarkRequest(provider=BenchmarkProvider.OLLAMA, model_name="demo")
+    )
+
+    assert run.id is not None
+    assert run.created_at is not None
+    assert run.status == "queued"
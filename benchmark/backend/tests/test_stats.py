@@ -35,3 +35,39 @@ def test_stats_accumulator_summary():
     assert summary["ttft_avg_ms"] == pytest.approx(55)
     assert summary["inter_token_latency_avg_ms"] == 0
     assert summary["tokens_per_second"] > 0
+
+
+def test_stats_accumulator_ignores_missing_inter_token_latency():
+    accumulator = StatsAccumulator()
+    accumulator.add(
+        RequestMetrics(
+            latency_ms=100, ttft_ms=10, tokens_generated=10, avg_inter_token_latency_ms=4.0
+        )
+    )
+    accumulator.add(
+        RequestMetrics(
+            latency_ms=100, ttft_ms=10, tokens_generated=10, avg_inter_token_latency_ms=0.0
+        )
+    )
+    accumulator.add(
+        RequestMetrics(
+            latency_ms=100, ttft_ms=10, tokens_generated=10, avg_inter_token_latency_ms=8.0
+        )
+    )
+
+    summary = accumulator.summarize()
+    assert summary["inter_token_latency_avg_ms"] == pytest.approx(6.0)
+    assert summary["tokens_per_second"] == pytest.approx(100.0)
+
+
+def test_stats_accumulator_reports_server_latency_separately():
+    accumulator = StatsAccumulator()
+    accumulator.add(
+        RequestMetrics(latency_ms=120, ttft_ms=10, tokens_generated=10, server_latency_ms=100.0)
+    )
+    accumulator.add(RequestMetrics(latency_ms=140, ttft_ms=10, tokens_generated=10))
+
+    summary = accumulator.summarize()
+    assert summary["latency_p50_ms"] == pytest.approx(130.0)
+    assert summary["server_latency_avg_ms"] == pytest.approx(100.0)
+    assert "server_latency_avg_ms" not in StatsAccumulator().summarize()
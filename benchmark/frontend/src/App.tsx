@@ -5,14 +5,14 @@ import { Loader2, ServerCog } from 'lucide-react';
 import { BenchmarkForm, BenchmarkFormState, BackendMetadata } from './components/BenchmarkForm';
 import { BenchmarkHistory, BenchmarkHistoryItem } from './components/BenchmarkHistory';
 import { AutoBenchmarkForm, AutoBenchmarkPayload } from './components/AutoBenchmarkForm';
-import { AutoBenchmarkResults } from './components/AutoBenchmarkResults';
+import { AutoBenchmarkItem, AutoBenchmarkResults } from './components/AutoBenchmarkResults';
 import { ModelManager } from './components/ModelManager';
 import { SummaryCards } from './components/SummaryCards';
-import { getJson, postJson } from './lib/api';
+import { getJson, postJson, postNdjson } from './lib/api';
 
 export default function App() {
   const queryClient = useQueryClient();
-  const [autoRuns, setAutoRuns] = useState<BenchmarkHistoryItem[]>([]);
+  const [autoRuns, setAutoRuns] = useState<AutoBenchmarkItem[]>([]);
 
   const backendsQuery = useQuery<BackendMetadata[]>({
     queryKey: ['backends'],
@@ -34,12 +34,13 @@ export default function App() {
   });
 
   const autoBenchmark = useMutation({
-    mutationFn: (payload: AutoBenchmarkPayload) => postJson<BenchmarkHistoryItem[]>(
-      '/api/benchmarks/auto',
-      payload
-    ),
-    onSuccess: (runs) => {
-      setAutoRuns(runs);
+    mutationFn: (payload: AutoBenchmarkPayload) => {
+      setAutoRuns([]);
+      return postNdjson<AutoBenchmarkItem>('/api/benchmarks/auto', payload, (run) =>
+        setAutoRuns((runs) => [...runs, run])
+      );
+    },
+    onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['benchmarks'] });
     },
   });
@@ -107,7 +108,11 @@ export default function App() {
         <AutoBenchmarkResults
           results={autoRuns}
           isRunning={autoBenchmark.isPending}
-          onClear={() => setAutoRuns([])}
+          error={autoBenchmark.error?.message}
+          onClear={() => {
+            setAutoRuns([]);
+            autoBenchmark.reset();
+          }}
         />
 
         {backendsQuery.data && backendsQuery.data.length > 0 && (
@@ -1,14 +1,21 @@
 import { BarChart3, CheckCircle2, Eraser } from 'lucide-react';
 
+import type { BenchmarkParameters } from './BenchmarkForm';
 import type { BenchmarkHistoryItem } from './BenchmarkHistory';
 
+export type AutoBenchmarkItem = BenchmarkHistoryItem & {
+  combination: number;
+  parameters: BenchmarkParameters;
+};
+
 interface Props {
-  results: BenchmarkHistoryItem[];
+  results: AutoBenchmarkItem[];
   isRunning: boolean;
+  error?: string | null;
   onClear: () => void;
 }
 
-export function AutoBenchmarkResults({ results, isRunning, onClear }: Props) {
+export function AutoBenchmarkResults({ results, isRunning, error, onClear }: Props) {
   const completed = results.filter((run) => run.status === 'completed');
   const bestLatency = completed
     .map((run) => run.metrics?.latency_p95_ms)
@@ -18,6 +25,8 @@ export function AutoBenchmarkResults({ results, isRunning, onClear }: Props) {
     .map((run) => run.metrics?.tokens_per_second)
     .filter((value): value is number => typeof value === 'number')
     .sort((a, b) => b - a)[0];
+  // Parallel sweeps stream in completion order; list them in grid order.
+  const rows = [...results].sort((a, b) => a.combination - b.combination);
 
   return (
     <section className="rounded-xl border border-slate-800 bg-slate-900/60 p-6">
@@ -40,6 +49,8 @@ export function AutoBenchmarkResults({ results, isRunning, onClear }: Props) {
         </button>
       </div>
 
+      {error && <p className="mt-4 text-sm text-red-400">{error}</p>}
+
       {results.length === 0 ? (
         <p className="mt-4 text-sm text-slate-400">
           {isRunning
@@ -71,15 +82,16 @@ export function AutoBenchmarkResults({ results, isRunning, onClear }: Props) {
               <thead className="bg-slate-800 text-slate-300">
                 <tr>
                   <th className="px-3 py-2">Run</th>
+                  <th className="px-3 py-2">Combination</th>
                   <th className="px-3 py-2">Status</th>
                   <th className="px-3 py-2">Tokens / TPS</th>
                   <th className="px-3 py-2">Latency P95</th>
                 </tr>
               </thead>
               <tbody>
-                {results.map((run, index) => {
-                  const displayId = run.id !== 0 ? run.id : index + 1;
-                  const rowKey = `${run.model_name}-${displayId}-${index}`;
+                {rows.map((run) => {
+                  const displayId = run.combination + 1;
+                  const rowKey = `${run.model_name}-${run.combination}`;
 
                   return (
                     <tr key={rowKey} className="border-b border-slate-800">
@@ -90,6 +102,13 @@ export function AutoBenchmarkResults({ results, isRunning, onClear }: Props) {
                       </div>
                       <p className="text-xs text-slate-400">{run.model_name}</p>
                     </td>
+                    <td className="px-3 py-2 text-xs text-slate-300">
+                      <div className="flex flex-col">
+                        <span>Concurrency {run.parameters.concurrency}</span>
+                        <span>Max tokens {run.parameters.max_tokens}</span>
+                        <span>Temperature {run.parameters.temperature}</span>
+                      </div>
+                    </td>
                     <td className="px-3 py-2 uppercase text-xs tracking-wide text-slate-400">{run.status}</td>
                     <td className="px-3 py-2 text-slate-200">
                       {run.metrics ? (
@@ -43,3 +43,55 @@ export function postJson<T>(path: string, body: unknown): Promise<T> {
     body: JSON.stringify(body),
   });
 }
+
+function isStreamError(item: unknown): item is { error: string } {
+  return (
+    typeof item === 'object' &&
+    item !== null &&
+    Object.keys(item).length === 1 &&
+    typeof (item as { error?: unknown }).error === 'string'
+  );
+}
+
+export async function postNdjson<T>(path: string, body: unknown, onItem: (item: T) => void): Promise<T[]> {
+  const response = await fetch(buildUrl(path), {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(body),
+  });
+  if (!response.ok || !response.body) {
+    const errorPayload = await response.json().catch(() => ({ detail: response.statusText }));
+    throw new Error(errorPayload.detail ?? 'Request failed');
+  }
+
+  const items: T[] = [];
+  const emit = (line: string) => {
+    if (line.trim()) {
+      const item = JSON.parse(line);
+      // A failure after the stream has started arrives as a final `{"error": ...}` row.
+      if (isStreamError(item)) {
+        throw new Error(item.error);
+      }
+      items.push(item as T);
+      onItem(item as T);
+    }
+  };
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop() ?? '';
+    lines.forEach(emit);
+  }
+  emit(buffered + decoder.decode());
+  return items;
+}